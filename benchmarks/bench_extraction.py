@@ -0,0 +1,80 @@
+# benchmarks/bench_extraction.py
+"""Benchmark de extração de artigos: páginas/segundo e paridade com a implementação original.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_extraction [--iterations 50]
+"""
+import argparse
+import glob
+import os
+import time
+
+from src.tools.extractor import FastExtractor, LegacyExtractor
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "html")
+
+def load_corpus() -> dict:
+    corpus = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html"))):
+        with open(path, "rb") as f:
+            corpus[os.path.basename(path)] = f.read()
+    corpus["synthetic_large.html"] = synthetic_large_page()
+    return corpus
+
+def synthetic_large_page(paragraphs: int = 400, links: int = 600) -> bytes:
+    # Página de portal grande: muita navegação, scripts e um artigo longo
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(links))
+    scripts = "".join(f"<script>var tracker{i} = {{id: {i}}};</script>" for i in range(50))
+    body = "".join(
+        f"<h2>Heading {i}</h2><p>Paragraph {i} with <a href='#'>a link</a> and <em>emphasis</em> about technology and design.</p>"
+        if i % 10 == 0 else f"<p>Paragraph {i} describing the story in more detail for benchmarking purposes.</p>"
+        for i in range(paragraphs)
+    )
+    html = (
+        f"<html><head><title>Large</title>{scripts}</head><body><nav><ul>{nav}</ul></nav>"
+        f"<div class='sidebar content-rail'><p>Sidebar</p></div><article>{body}</article>"
+        f"<footer><p>Footer</p></footer></body></html>"
+    )
+    return html.encode("utf-8")
+
+def throughput(extractor, corpus: dict, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for content in corpus.values():
+            extractor.extract(content)
+    elapsed = time.perf_counter() - start
+    return len(corpus) * iterations / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    reference = LegacyExtractor(parser="html.parser")
+
+    candidates = [LegacyExtractor(parser="html.parser"), FastExtractor(parser="html.parser")]
+    try:
+        import lxml  # noqa: F401
+        candidates.append(FastExtractor(parser="lxml"))
+    except ImportError:
+        print("ℹ️  lxml não instalado: backend rápido de parsing não será medido.")
+
+    print(f"📚 Corpus: {len(corpus)} páginas ({sum(len(c) for c in corpus.values()) / 1024:.0f} KB)\n")
+
+    print("🔎 Paridade com a implementação original (legacy + html.parser):")
+    expected = {name: reference.extract(content) for name, content in corpus.items()}
+    for extractor in candidates[1:]:
+        mismatches = [name for name, content in corpus.items() if extractor.extract(content) != expected[name]]
+        status = "✅ idêntico" if not mismatches else f"❌ divergente em {', '.join(mismatches)}"
+        print(f"   {extractor.name:>6} / {extractor.parser:<11} {status}")
+
+    print(f"\n⏱️  Throughput ({args.iterations} iterações):")
+    baseline = None
+    for extractor in candidates:
+        pages_per_sec = throughput(extractor, corpus, args.iterations)
+        baseline = baseline or pages_per_sec
+        print(f"   {extractor.name:>6} / {extractor.parser:<11} {pages_per_sec:8.1f} páginas/s  ({pages_per_sec / baseline:.2f}x)")
+
+if __name__ == "__main__":
+    main()
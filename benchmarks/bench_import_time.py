@@ -0,0 +1,74 @@
+# benchmarks/bench_import_time.py
+"""Mede o tempo de inicialização da CLI com `python -X importtime`.
+
+Falha (código de saída 1) se o import de `src.main` passar do orçamento ou se algum
+módulo pesado for importado antes de ser necessário.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_import_time [--budget-ms 150] [--runs 5] [--top 10]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# Módulos que só devem ser carregados quando uma etapa do pipeline precisar deles
+HEAVY_MODULES = ["crewai", "langchain", "langchain_core", "langchain_groq", "deep_translator", "bs4", "lxml", "requests", "pydantic", "numpy", "sentence_transformers"]
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def measure(target: str) -> list:
+    """Executa o import em um processo novo e retorna [(módulo, self_us, cumulative_us, depth)]."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=root, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {target}:\n{result.stderr}")
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="src.main")
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    totals, entries = [], []
+    for _ in range(args.runs):
+        entries = measure(args.target)
+        target_entry = next(e for e in entries if e[0] == args.target)
+        totals.append(target_entry[2] / 1000)
+
+    best = min(totals)
+    print(f"⏱️  import {args.target}: melhor {best:.1f} ms, mediana {sorted(totals)[len(totals) // 2]:.1f} ms ({args.runs} execuções)")
+
+    print(f"\n🐢 {args.top} módulos mais lentos (tempo próprio):")
+    for module, self_us, cumulative_us, _ in sorted(entries, key=lambda e: e[1], reverse=True)[:args.top]:
+        print(f"   {self_us / 1000:7.1f} ms  (acumulado {cumulative_us / 1000:7.1f} ms)  {module}")
+
+    loaded = {module for module, *_ in entries}
+    eager = [module for module in HEAVY_MODULES if module in loaded]
+
+    failed = False
+    if eager:
+        print(f"\n❌ Módulos pesados importados na inicialização: {', '.join(eager)}")
+        failed = True
+    if best > args.budget_ms:
+        print(f"\n❌ Inicialização acima do orçamento de {args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print(f"\n✅ Inicialização dentro do orçamento de {args.budget_ms:.0f} ms, sem imports pesados antecipados")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
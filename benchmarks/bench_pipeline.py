@@ -0,0 +1,266 @@
+# benchmarks/bench_pipeline.py
+"""Benchmark offline de ponta a ponta: `NewsCrew.run` e cada ferramenta contra serviços locais.
+
+NewsAPI, sites de notícias (com latência e falhas 403/429/timeout), LLM, tradutor e SendGrid
+são substituídos por equivalentes locais e determinísticos (veja `benchmarks/fake_services.py`).
+Para cada tamanho são medidos a latência por etapa, o throughput total e o pico de memória.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_pipeline [--sizes 6 60 600] [--json resultado.json]
+    python -m benchmarks.bench_pipeline --baseline resultado.json   # falha se houver regressão
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_services import FakeServices, FaultProfile
+
+STAGES = ["stage.search", "stage.process", "stage.summarize", "stage.translate", "stage.send"]
+QUERIES = ["technology trends", "user experience design UX"]
+
+@contextlib.contextmanager
+def patched_env(values: dict):
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+@contextlib.contextmanager
+def quiet(enabled: bool = True):
+    # O pipeline imprime o progresso de cada artigo; nos benchmarks só interessa o relatório
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+@contextlib.contextmanager
+def offline_environment(size: int, args):
+    """Sobe os serviços falsos e aponta o pipeline para eles, com caches vazios em um diretório temporário."""
+    workdir = tempfile.mkdtemp(prefix="newsletter-bench-")
+    faults = FaultProfile(
+        latency=args.site_latency,
+        forbidden_rate=args.forbidden_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        timeout_rate=args.timeout_rate,
+        hang=args.article_timeout + 1,
+    )
+    per_query = max(1, size // len(QUERIES))
+    try:
+        with FakeServices(articles_per_query=per_query, sites=args.sites, faults=faults, seed=args.seed) as services:
+            env = {
+                **services.env(),
+                "NEWSLETTER_CACHE_DIR": workdir,
+                "NEWSAPI_PAGE_SIZE": str(per_query),
+                "NEWSAPI_MONTHLY_QUOTA": "1000000",
+                "SUMMARY_LLM_BACKEND": "fake",
+                "FAKE_LLM_LATENCY": str(args.llm_latency),
+                "FAKE_LLM_LATENCY_PER_TOKEN": str(args.llm_latency_per_token),
+                "TRANSLATION_BACKEND": "fake",
+                "FAKE_TRANSLATOR_LATENCY": str(args.translator_latency),
+                "SENDGRID_MAX_REQUESTS_PER_SECOND": "0",
+            }
+            with patched_env(env):
+                yield services
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def fresh_tools() -> dict:
+    # Instâncias novas para ler as variáveis de ambiente do cenário (os singletons já foram criados)
+    from src.tools.browser_tools import NewsSearchTool
+    from src.tools.email_tools import EmailTool
+    from src.tools.fetch_cache import FetchCache
+    from src.tools.summary_cache import SummaryCache
+    from src.tools.summary_tool import SummaryTool
+    return {
+        "browser": NewsSearchTool(),
+        "summary": SummaryTool(cache=FetchCache(), summaries=SummaryCache()),
+        "email": EmailTool(),
+    }
+
+def warm_up():
+    # Imports e inicialização do parser ficam fora das medições de tempo e memória
+    from src.crew.news_crew import NewsCrew  # noqa: F401
+    from src.tools.extractor import _soup, default_parser
+    fresh_tools()
+    _soup(b"<html><body><p>warm up</p></body></html>", default_parser())
+
+def bench_pipeline(size: int, args) -> dict:
+    from src.crew.news_crew import NewsCrew
+    from src.tools.metrics import metrics
+
+    with offline_environment(size, args) as services:
+        recipients = [f"reader{i}@example.com" for i in range(args.recipients)]
+        crew = NewsCrew(recipients)
+        crew.tools.update(fresh_tools())
+        crew.max_workers = args.workers
+        crew.article_timeout = args.article_timeout
+        # Todos os `size` artigos devem atravessar o pipeline: sem o corte por relevância
+        crew.rank_overfetch = 1
+
+        metrics.reset()
+        tracemalloc.start()
+        start = time.perf_counter()
+        with quiet(not args.verbose):
+            result = crew.run()
+        wall = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        served = dict(services.stats)
+
+    report = metrics.summary()
+    counters = {}
+    for counter in report["counters"]:
+        label = ",".join(f"{k}={v}" for k, v in counter.get("labels", {}).items())
+        counters[f"{counter['name']}[{label}]" if label else counter["name"]] = counter["value"]
+    return {
+        "size": size,
+        "wall": wall,
+        "throughput": size / wall,
+        "peak_mb": peak / 1024 / 1024,
+        "stages": {stage: report["spans"].get(stage, {}).get("total", 0.0) for stage in STAGES},
+        "counters": counters,
+        "served": served,
+        "result": result,
+    }
+
+def _timed(work) -> float:
+    start = time.perf_counter()
+    with quiet():
+        work()
+    return time.perf_counter() - start
+
+def bench_tools(size: int, args) -> dict:
+    """Throughput de cada ferramenta isolada (itens por segundo)."""
+    from src.tools.translation import TranslationEngine
+
+    with offline_environment(size, args):
+        tools = fresh_tools()
+        per_query = max(1, size // len(QUERIES))
+        found = {}
+
+        def search():
+            found.update(tools["browser"].search_many(QUERIES, max_results=per_query))
+
+        elapsed = {"search": _timed(search)}
+        urls = [article["url"] for articles in found.values() for article in articles]
+
+        texts = []
+        def extract():
+            with ThreadPoolExecutor(max_workers=args.workers) as executor:
+                for text, _ in executor.map(tools["summary"].extract, urls):
+                    if text:
+                        texts.append(text)
+        elapsed["extract"] = _timed(extract)
+
+        summaries = []
+        def summarize():
+            with ThreadPoolExecutor(max_workers=args.workers) as executor:
+                summaries.extend(executor.map(lambda t: tools["summary"].summarize_text("bench", t), texts))
+        elapsed["summarize"] = _timed(summarize)
+
+        translator = TranslationEngine()
+        elapsed["translate"] = _timed(lambda: translator.translate_many(summaries))
+
+        recipients = [f"reader{i}@example.com" for i in range(size)]
+        elapsed["send"] = _timed(lambda: tools["email"].send_bulk(recipients, "<html><body>bench</body></html>"))
+
+    items = {"search": len(urls), "extract": len(urls), "summarize": len(texts), "translate": len(summaries), "send": size}
+    return {name: items[name] / seconds if seconds else 0.0 for name, seconds in elapsed.items()}
+
+def compare(results: list, baseline: list, tolerance: float, floor: float) -> list:
+    """Lista as regressões: métricas mais lentas que a base por mais de `tolerance` (e `floor` segundos)."""
+    by_size = {entry["size"]: entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        base = by_size.get(entry["size"])
+        if base is None:
+            continue
+        checks = [("wall", entry["wall"], base["wall"])]
+        checks += [(stage, entry["stages"][stage], base["stages"].get(stage, 0.0)) for stage in STAGES]
+        for name, current, previous in checks:
+            if current > previous * (1 + tolerance) and current - previous > floor:
+                regressions.append(f"{entry['size']} artigos / {name}: {previous:.2f}s -> {current:.2f}s")
+        if entry["peak_mb"] > base["peak_mb"] * (1 + tolerance) and entry["peak_mb"] - base["peak_mb"] > 1:
+            regressions.append(f"{entry['size']} artigos / memória: {base['peak_mb']:.1f} MB -> {entry['peak_mb']:.1f} MB")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[6, 60, 600])
+    parser.add_argument("--recipients", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("SUMMARY_MAX_WORKERS", "4")))
+    parser.add_argument("--sites", type=int, default=8, help="hosts distintos servindo artigos")
+    parser.add_argument("--site-latency", type=float, default=0.05)
+    parser.add_argument("--forbidden-rate", type=float, default=0.03)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.03)
+    parser.add_argument("--timeout-rate", type=float, default=0.01)
+    parser.add_argument("--article-timeout", type=float, default=5.0, help="prazo por artigo no NewsCrew")
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--llm-latency-per-token", type=float, default=0.0)
+    parser.add_argument("--translator-latency", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-tools", action="store_true", help="mede apenas o NewsCrew.run")
+    parser.add_argument("--json", help="salva os resultados para comparações futuras")
+    parser.add_argument("--baseline", help="resultados anteriores (--json) para detectar regressões")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="piora relativa aceita em relação à base")
+    parser.add_argument("--floor", type=float, default=0.1, help="piora absoluta (s) abaixo da qual não há regressão")
+    parser.add_argument("--verbose", action="store_true", help="mostra a saída do pipeline")
+    args = parser.parse_args()
+
+    warm_up()
+    results = []
+    for size in args.sizes:
+        print(f"🚀 {size} artigos...")
+        entry = bench_pipeline(size, args)
+        if not args.skip_tools:
+            entry["tools"] = bench_tools(size, args)
+        results.append(entry)
+
+    print(f"\n⏱️  NewsCrew.run ({args.workers} workers, {args.recipients} destinatários, tempo por etapa em s):")
+    header = "".join(f"{stage.split('.')[1]:>11}" for stage in STAGES)
+    print(f"   {'artigos':>7}{header}{'total':>9}{'artigos/s':>11}{'pico MB':>9}  enviados  pulados")
+    for entry in results:
+        stages = "".join(f"{entry['stages'][stage]:>11.2f}" for stage in STAGES)
+        skipped = sum(v for k, v in entry["counters"].items() if k.startswith("skips"))
+        print(f"   {entry['size']:>7}{stages}{entry['wall']:>9.2f}{entry['throughput']:>11.1f}{entry['peak_mb']:>9.1f}"
+              f"  {entry['counters'].get('articles_sent', 0):>8g}  {skipped:>7g}")
+
+    if not args.skip_tools:
+        print("\n🧰 Ferramentas isoladas (itens/s):")
+        names = list(results[0]["tools"])
+        print(f"   {'artigos':>7}" + "".join(f"{name:>11}" for name in names))
+        for entry in results:
+            print(f"   {entry['size']:>7}" + "".join(f"{entry['tools'][name]:>11.1f}" for name in names))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados salvos em {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.floor)
+        if regressions:
+            print(f"\n❌ Regressões em relação a {args.baseline}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print(f"\n✅ Sem regressões em relação a {args.baseline} (tolerância de {args.tolerance:.0%}).")
+
+if __name__ == "__main__":
+    main()
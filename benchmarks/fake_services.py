@@ -0,0 +1,230 @@
+# benchmarks/fake_services.py
+"""Servidores HTTP locais que substituem a NewsAPI, os sites de notícias e o SendGrid nos benchmarks.
+
+Tudo é determinístico: o conteúdo, a latência e as falhas de cada artigo dependem só da semente
+e do identificador do artigo. O LLM e o tradutor falsos ficam em `src` (SUMMARY_LLM_BACKEND=fake e
+TRANSLATION_BACKEND=fake).
+"""
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_VOCABULARY = (
+    "design interface product research prototype network model data cloud security mobile browser "
+    "pattern system layout accessibility performance startup market chip battery camera sensor robot "
+    "platform developer framework release update policy privacy engine search video audio display "
+    "wearable vehicle energy satellite quantum neural language vision memory storage server cluster "
+    "latency bandwidth protocol standard feature experiment survey metric usability workflow typography "
+    "color motion gesture voice assistant payment wallet commerce creator community moderation ranking"
+).split()
+
+@dataclass
+class FaultProfile:
+    """Latência e taxas de falha simuladas dos sites de notícias."""
+    latency: float = 0.05
+    jitter: float = 0.5            # fração da latência sorteada para mais ou para menos
+    forbidden_rate: float = 0.03   # 403 permanente
+    rate_limit_rate: float = 0.03  # 429 só na primeira requisição (o SummaryTool tenta de novo)
+    timeout_rate: float = 0.01     # resposta que demora `hang` segundos
+    hang: float = 3.0
+    long_article_rate: float = 0.05  # artigos maiores que a janela de contexto (map-reduce)
+
+def _rng(seed: int, *parts) -> random.Random:
+    return random.Random("|".join([str(seed), *map(str, parts)]))
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(_VOCABULARY) for _ in range(count))
+
+def article_title(seed: int, query: str, index: int) -> str:
+    rng = _rng(seed, "title", query, index)
+    return f"{_words(rng, 7).capitalize()} ({index})"
+
+def article_html(seed: int, slug: str, faults: FaultProfile) -> bytes:
+    """Página de notícia com navegação, scripts e um artigo de tamanho variável."""
+    rng = _rng(seed, "page", slug)
+    long_article = rng.random() < faults.long_article_rate
+    paragraphs = rng.randint(60, 90) if long_article else rng.randint(4, 12)
+    body = "".join(
+        f"<p>{_words(rng, rng.randint(40, 90)).capitalize()}.</p>" for _ in range(paragraphs)
+    )
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(40))
+    html = (
+        f"<html><head><title>{slug}</title><script>var t = 1;</script></head><body>"
+        f"<nav><ul>{nav}</ul></nav><article><h1>{_words(rng, 6)}</h1>{body}</article>"
+        f"<footer><p>Footer</p></footer></body></html>"
+    )
+    return html.encode("utf-8")
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, body: bytes = b"", content_type: str = "application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        services = self.server.services
+        parsed = urlparse(self.path)
+        if parsed.path == "/v2/everything":
+            return self._reply(200, json.dumps(services.news_page(parse_qs(parsed.query))).encode("utf-8"))
+        match = re.fullmatch(r"/news/([\w-]+)", parsed.path)
+        if match:
+            status, body = services.article(match.group(1))
+            return self._reply(status, body, "text/html; charset=utf-8")
+        self._reply(404)
+
+    def do_POST(self):
+        services = self.server.services
+        length = int(self.headers.get("Content-Length", "0"))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if urlparse(self.path).path == "/v3/mail/send":
+            status = services.mail(payload)
+            return self._reply(status)
+        self._reply(404)
+
+class FakeServices:
+    """NewsAPI, sites de notícias (um servidor por host de loopback) e SendGrid falsos.
+
+    Uso:
+        with FakeServices(articles_per_query=30) as services:
+            os.environ.update(services.env())
+    """
+
+    def __init__(self, articles_per_query: int = 3, sites: int = 8, faults: FaultProfile = None,
+                 seed: int = 42, duplicate_every: int = 10, mail_latency: float = 0.02):
+        self.articles_per_query = articles_per_query
+        self.faults = faults or FaultProfile()
+        self.seed = seed
+        self.duplicate_every = duplicate_every
+        self.mail_latency = mail_latency
+        self._requested_sites = max(1, sites)
+        self._servers = []
+        self._lock = threading.Lock()
+        self._seen = set()
+        self.stats = {"news_requests": 0, "article_requests": 0, "mail_requests": 0, "mail_recipients": 0}
+
+    # --- ciclo de vida ---
+
+    def start(self):
+        # Cada site em um endereço de loopback diferente (127.0.0.2, 127.0.0.3, ...), para que o
+        # limite de conexões por host do NewsCrew se comporte como com sites reais
+        for i in range(self._requested_sites):
+            try:
+                self._servers.append(self._serve(f"127.0.0.{i + 2}"))
+            except OSError:
+                break  # sistemas que só aceitam 127.0.0.1 (ex.: macOS sem aliases)
+        self._api = self._serve("127.0.0.1")
+        if not self._servers:
+            self._servers.append(self._api)
+        return self
+
+    def _serve(self, host: str) -> ThreadingHTTPServer:
+        server = ThreadingHTTPServer((host, 0), _Handler)
+        server.daemon_threads = True
+        server.services = self
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def stop(self):
+        for server in {id(s): s for s in [self._api, *self._servers]}.values():
+            server.shutdown()
+            server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @staticmethod
+    def _base_url(server: ThreadingHTTPServer) -> str:
+        host, port = server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def sites(self) -> int:
+        return len(self._servers)
+
+    def env(self) -> dict:
+        """Variáveis de ambiente que apontam o pipeline para os serviços locais."""
+        api = self._base_url(self._api)
+        return {
+            "NEWSAPI_BASE_URL": f"{api}/v2",
+            "NEWSAPI_KEY": "offline",
+            "SENDGRID_API_URL": f"{api}/v3/mail/send",
+            "SENDGRID_API_KEY": "offline",
+            "SENDER_EMAIL": "newsletter@example.com",
+        }
+
+    def _count(self, key: str, value: int = 1):
+        with self._lock:
+            self.stats[key] += value
+
+    # --- NewsAPI ---
+
+    def article_url(self, query: str, index: int) -> str:
+        slug = f"{re.sub(r'[^a-z0-9]+', '-', query.lower()).strip('-')}-{index}"
+        server = self._servers[index % len(self._servers)]
+        return f"{self._base_url(server)}/news/{slug}"
+
+    def news_page(self, params: dict) -> dict:
+        self._count("news_requests")
+        query = params.get("q", [""])[0]
+        page_size = int(params.get("pageSize", ["20"])[0])
+        page = int(params.get("page", ["1"])[0])
+        articles = []
+        for index in range((page - 1) * page_size, min(page * page_size, self.articles_per_query)):
+            url = self.article_url(query, index)
+            if self.duplicate_every and index and index % self.duplicate_every == 0:
+                # Agregadores repetem a mesma matéria com parâmetros de rastreamento
+                url = f"{self.article_url(query, index - 1)}?utm_source=feed&utm_medium=rss"
+            articles.append({
+                "title": article_title(self.seed, query, index),
+                "url": url,
+                "description": f"Description of {query} story {index}",
+            })
+        return {"status": "ok", "totalResults": self.articles_per_query, "articles": articles}
+
+    # --- sites de notícias ---
+
+    def article(self, slug: str):
+        self._count("article_requests")
+        faults = self.faults
+        rng = _rng(self.seed, "fault", slug)
+        latency = faults.latency * (1 + faults.jitter * (2 * rng.random() - 1))
+        roll = rng.random()
+        with self._lock:
+            first_request = slug not in self._seen
+            self._seen.add(slug)
+
+        if roll < faults.timeout_rate:
+            time.sleep(faults.hang)
+        else:
+            time.sleep(max(0.0, latency))
+        roll -= faults.timeout_rate
+        if 0 <= roll < faults.forbidden_rate:
+            return 403, b"<html><body>Forbidden</body></html>"
+        roll -= faults.forbidden_rate
+        if 0 <= roll < faults.rate_limit_rate and first_request:
+            return 429, b"<html><body>Too Many Requests</body></html>"
+        return 200, article_html(self.seed, slug, faults)
+
+    # --- SendGrid ---
+
+    def mail(self, payload: dict) -> int:
+        self._count("mail_requests")
+        self._count("mail_recipients", sum(len(p.get("to", [])) for p in payload.get("personalizations", [])))
+        if self.mail_latency:
+            time.sleep(self.mail_latency)
+        return 202
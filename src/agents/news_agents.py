@@ -1,12 +1,18 @@
 # src/agents/news_agents.py
-import os
 from crewai import Agent
-from langchain_groq import ChatGroq
+from src.tools.llm_gateway import llm_gateway
 from textwrap import dedent
 
 class NewsAgents:
     def __init__(self):
-        self.llm = ChatGroq(api_key=os.getenv("GROQ_API_KEY"), model_name="llama3-8b-8192")
+        self._llm = None
+
+    @property
+    def llm(self):
+        # O cliente só é construído quando o primeiro agente é criado e divide a cota da Groq com os resumos
+        if self._llm is None:
+            self._llm = llm_gateway.chat_model("llama3-8b-8192")
+        return self._llm
 
     def make_researcher_agent(self) -> Agent:
         return Agent(
@@ -0,0 +1,169 @@
+# src/crew/checkpoints.py
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from src.tools.storage import cache_path, connect
+
+# Estados de uma execução
+RUNNING = "running"
+SENT = "sent"
+FAILED = "failed"
+
+def current_window() -> str:
+    """Janela de execução usada pelo modo incremental (padrão: o dia corrente)."""
+    return time.strftime(os.getenv("NEWSLETTER_RUN_WINDOW", "%Y-%m-%d"))
+
+def new_run_id() -> str:
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+class CheckpointStore:
+    """Saída de cada etapa persistida por execução e item, para retomar ou reaproveitar trabalho já pago.
+
+    Etapas gravadas pelo `NewsCrew`: `search` (por consulta), `summary` e `translation` (por URL
+    canônica) e `send` (por destinatário atendido).
+    """
+
+    def __init__(self, path: str = None, retention_days: float = None):
+        self.path = path or os.getenv("CHECKPOINT_PATH") or cache_path("checkpoints.sqlite3")
+        self.retention_days = retention_days if retention_days is not None else float(os.getenv("CHECKPOINT_RETENTION_DAYS", "7"))
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect(self.path)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    run_window TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS items (
+                    run_id TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (run_id, stage, key)
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS runs_window ON runs (run_window, created_at)")
+            self._conn.commit()
+        return self._conn
+
+    def start_run(self, run_id: str = None, window: str = None) -> str:
+        """Registra uma nova execução e remove as que passaram do prazo de retenção."""
+        run_id = run_id or new_run_id()
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR IGNORE INTO runs (run_id, run_window, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (run_id, window or current_window(), RUNNING, now, now),
+            )
+            db.commit()
+        self.purge(self.retention_days * 86400)
+        return run_id
+
+    def set_status(self, run_id: str, status: str):
+        with self._lock:
+            db = self._db()
+            db.execute("UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?", (status, time.time(), run_id))
+            db.commit()
+
+    def run_info(self, run_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT run_id, run_window, status, created_at FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return dict(zip(("run_id", "window", "status", "created_at"), row)) if row else None
+
+    def latest_unfinished(self) -> Optional[str]:
+        """Execução mais recente que não chegou a enviar a newsletter."""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT run_id FROM runs WHERE status != ? ORDER BY created_at DESC LIMIT 1", (SENT,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def window_runs(self, window: str, exclude: str = None, unsent_only: bool = False) -> List[str]:
+        """Execuções da janela, da mais antiga para a mais nova (com `unsent_only`, só as que não enviaram)."""
+        query = "SELECT run_id FROM runs WHERE run_window = ? AND run_id != ?"
+        params = [window, exclude or ""]
+        if unsent_only:
+            query += " AND status != ?"
+            params.append(SENT)
+        with self._lock:
+            rows = self._db().execute(query + " ORDER BY created_at", params).fetchall()
+        return [row[0] for row in rows]
+
+    def put(self, run_id: str, stage: str, key: str, payload):
+        self.put_many(run_id, stage, {key: payload})
+
+    def put_many(self, run_id: str, stage: str, items: Dict[str, object]):
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.executemany(
+                "INSERT OR REPLACE INTO items (run_id, stage, key, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, stage, key, json.dumps(payload, ensure_ascii=False), now) for key, payload in items.items()],
+            )
+            db.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+            db.commit()
+
+    def load(self, run_id: str, stage: str) -> Dict[str, object]:
+        """Itens gravados de uma etapa, na ordem em que foram concluídos."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT key, payload FROM items WHERE run_id = ? AND stage = ? ORDER BY created_at, rowid", (run_id, stage)
+            ).fetchall()
+        return {key: json.loads(payload) for key, payload in rows}
+
+    def purge(self, older_than: float) -> int:
+        """Remove execuções (e seus itens) sem atividade há mais de `older_than` segundos."""
+        cutoff = time.time() - older_than
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM items WHERE run_id IN (SELECT run_id FROM runs WHERE updated_at < ?)", (cutoff,))
+            removed = db.execute("DELETE FROM runs WHERE updated_at < ?", (cutoff,)).rowcount
+            db.commit()
+            return removed
+
+    def list_runs(self, limit: int = 20) -> List[dict]:
+        with self._lock:
+            rows = self._db().execute("""
+                SELECT r.run_id, r.run_window, r.status, r.created_at,
+                       (SELECT COUNT(*) FROM items i WHERE i.run_id = r.run_id AND i.stage = 'summary')
+                FROM runs r ORDER BY r.created_at DESC LIMIT ?
+            """, (limit,)).fetchall()
+        return [dict(zip(("run_id", "window", "status", "created_at", "summaries"), row)) for row in rows]
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerencia os checkpoints das execuções da newsletter.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    runs = sub.add_parser("list", help="Lista as execuções mais recentes")
+    runs.add_argument("--limit", type=int, default=20)
+    purge = sub.add_parser("purge", help="Remove execuções antigas")
+    purge.add_argument("--older-than-days", type=float, default=0, help="Remove execuções sem atividade há mais de N dias")
+    args = parser.parse_args()
+
+    store = CheckpointStore()
+    if args.command == "list":
+        for run in store.list_runs(args.limit):
+            created = time.strftime("%Y-%m-%d %H:%M", time.localtime(run["created_at"]))
+            print(f"{run['run_id']}  {created}  janela={run['window']}  {run['status']:<8} {run['summaries']} resumos")
+    else:
+        removed = store.purge(args.older_than_days * 86400)
+        print(f"🗑️  {removed} execuções removidas de {store.path}")
+
+if __name__ == "__main__":
+    main()
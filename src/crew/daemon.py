@@ -0,0 +1,430 @@
+# src/crew/daemon.py
+import json
+import os
+import queue
+import signal
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from src.crew.dedup import SimHashIndex, simhash
+from src.tools.llm_gateway import PRIORITY_LOW, priority
+from src.tools.metrics import metrics
+from src.tools.storage import cache_path, connect
+
+# Estados de um artigo no estoque
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+DUPLICATE = "duplicate"
+SENT = "sent"
+
+_WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+def next_send_time(spec: str, now: datetime = None) -> Optional[datetime]:
+    """Próximo horário de envio para uma agenda semanal como "mon 08:00" (None se vazia)."""
+    if not spec:
+        return None
+    day, clock = spec.lower().split()
+    hour, minute = (int(part) for part in clock.split(":"))
+    now = now or datetime.now()
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    target += timedelta(days=(_WEEKDAYS.index(day[:3]) - now.weekday()) % 7)
+    if target <= now:
+        target += timedelta(days=7)
+    return target
+
+class ReadyStore:
+    """Estoque persistente de artigos do modo daemon: pendentes, prontos (traduzidos), com falha e enviados."""
+
+    def __init__(self, path: str = None, retention_days: float = None, max_attempts: int = None, retry_backoff: float = None):
+        self.path = path or os.getenv("DAEMON_STORE_PATH") or cache_path("ready_items.sqlite3")
+        self.retention_days = retention_days if retention_days is not None else float(os.getenv("DAEMON_RETENTION_DAYS", "30"))
+        # Falhas (site fora do ar, LLM, tradutor) voltam a ser buscadas com backoff exponencial
+        self.max_attempts = max_attempts or int(os.getenv("DAEMON_MAX_ATTEMPTS", "5"))
+        self.retry_backoff = retry_backoff if retry_backoff is not None else float(os.getenv("DAEMON_RETRY_BACKOFF", "3600"))
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect(self.path)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS items (
+                    url TEXT PRIMARY KEY,
+                    category TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payload TEXT,
+                    text_fp TEXT,
+                    found_at REAL NOT NULL,
+                    ready_at REAL,
+                    sent_at REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    retry_at REAL
+                )
+            """)
+            # Estoques criados antes das novas tentativas
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(items)")}
+            if "attempts" not in columns:
+                self._conn.execute("ALTER TABLE items ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+                self._conn.execute("ALTER TABLE items ADD COLUMN retry_at REAL")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS items_status ON items (status, ready_at)")
+            self._conn.commit()
+        return self._conn
+
+    def claim(self, articles: List[dict]) -> List[dict]:
+        """Registra como pendentes os artigos desconhecidos ou com nova tentativa vencida e retorna apenas esses."""
+        now = time.time()
+        claimed = []
+        with self._lock:
+            db = self._db()
+            for article in articles:
+                cursor = db.execute(
+                    "INSERT OR IGNORE INTO items (url, category, status, found_at) VALUES (?, ?, ?, ?)",
+                    (article['canonical_url'], article['category'], PENDING, now),
+                )
+                if not cursor.rowcount:
+                    cursor = db.execute(
+                        "UPDATE items SET status = ?, retry_at = NULL WHERE url = ? AND status = ? AND retry_at <= ?",
+                        (PENDING, article['canonical_url'], FAILED, now),
+                    )
+                if cursor.rowcount:
+                    claimed.append(article)
+            db.commit()
+        return claimed
+
+    def release_pending(self) -> int:
+        """Esquece artigos que ficaram pendentes (processo interrompido) para que sejam buscados de novo."""
+        with self._lock:
+            db = self._db()
+            removed = db.execute("DELETE FROM items WHERE status = ?", (PENDING,)).rowcount
+            db.commit()
+            return removed
+
+    def mark_ready(self, items: List[dict]):
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.executemany(
+                "UPDATE items SET status = ?, payload = ?, text_fp = ?, ready_at = ? WHERE url = ?",
+                [
+                    (READY, json.dumps(item, ensure_ascii=False),
+                     format(item['text_fp'], "016x") if item.get('text_fp') is not None else None, now, item['canonical_url'])
+                    for item in items
+                ],
+            )
+            db.commit()
+
+    def mark_failed(self, url: str):
+        """Falha de um artigo pendente: nova tentativa após o backoff, até `max_attempts` tentativas."""
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT attempts FROM items WHERE url = ? AND status = ?", (url, PENDING)).fetchone()
+            if row is None:
+                return
+            attempts = row[0] + 1
+            retry_at = now + self.retry_backoff * 2 ** (attempts - 1) if attempts < self.max_attempts else None
+            db.execute("UPDATE items SET status = ?, attempts = ?, retry_at = ? WHERE url = ?", (FAILED, attempts, retry_at, url))
+            db.commit()
+
+    def mark_duplicate(self, urls: List[str]):
+        """Mesma matéria de outro veículo já pronta: o artigo não é buscado de novo."""
+        with self._lock:
+            db = self._db()
+            db.executemany("UPDATE items SET status = ? WHERE url = ?", [(DUPLICATE, url) for url in urls])
+            db.commit()
+
+    def mark_sent(self, urls: List[str]):
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.executemany("UPDATE items SET status = ?, sent_at = ? WHERE url = ?", [(SENT, now, url) for url in urls])
+            db.commit()
+
+    def ready_fingerprints(self) -> list:
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT url, text_fp FROM items WHERE status IN (?, ?) AND text_fp IS NOT NULL", (READY, SENT)
+            ).fetchall()
+        return [(url, int(text_fp, 16)) for url, text_fp in rows]
+
+    def select(self, per_category: int, max_age: float) -> List[dict]:
+        """Os itens prontos mais recentes de cada seção, ainda não enviados."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT category, payload FROM items WHERE status = ? AND ready_at >= ? ORDER BY ready_at DESC",
+                (READY, time.time() - max_age),
+            ).fetchall()
+        selected, counts = [], {}
+        for category, payload in rows:
+            if counts.get(category, 0) < per_category:
+                counts[category] = counts.get(category, 0) + 1
+                selected.append(json.loads(payload))
+        return selected
+
+    def counts(self) -> dict:
+        with self._lock:
+            return dict(self._db().execute("SELECT status, COUNT(*) FROM items GROUP BY status").fetchall())
+
+    def purge(self) -> int:
+        with self._lock:
+            db = self._db()
+            removed = db.execute("DELETE FROM items WHERE found_at < ?", (time.time() - self.retention_days * 86400,)).rowcount
+            db.commit()
+            return removed
+
+class NewsDaemon:
+    """Modo contínuo: busca, resume e traduz artigos ao longo da semana; no envio só seleciona e entrega.
+
+    Um produtor consulta a NewsAPI periodicamente e coloca os artigos novos em uma fila limitada;
+    workers de resumo consomem a fila e um worker de tradução agrupa os resumos em lotes antes de
+    gravá-los prontos no `ReadyStore`.
+    """
+
+    def __init__(self, crew, store: ReadyStore = None, poll_interval: float = None, queue_size: int = None,
+                 workers: int = None, results_per_topic: int = None, per_section: int = None, send_at: str = None):
+        self.crew = crew
+        self.store = store or ReadyStore()
+        self.poll_interval = poll_interval if poll_interval is not None else float(os.getenv("DAEMON_POLL_INTERVAL", "3600"))
+        self.results_per_topic = results_per_topic or int(os.getenv("DAEMON_RESULTS_PER_TOPIC", "10"))
+        self.workers = workers or int(os.getenv("DAEMON_SUMMARY_WORKERS", "2"))
+        self.per_section = per_section or int(os.getenv("NEWSLETTER_ITEMS_PER_SECTION", "3"))
+        self.max_item_age = float(os.getenv("DAEMON_MAX_ITEM_AGE_DAYS", "7")) * 86400
+        self.send_at = send_at if send_at is not None else os.getenv("NEWSLETTER_SEND_AT", "")
+        self.translation_batch = int(os.getenv("DAEMON_TRANSLATION_BATCH", "20"))
+        self.translation_wait = float(os.getenv("DAEMON_TRANSLATION_WAIT", "5"))
+        self.translation_retries = int(os.getenv("DAEMON_TRANSLATION_RETRIES", "3"))
+        # Tentativas de tradução por URL (só o worker de tradução acessa)
+        self._translation_attempts = {}
+        # Fila limitada: se os workers atrasarem, o produtor espera em vez de acumular artigos em memória
+        self.articles = queue.Queue(maxsize=queue_size or int(os.getenv("DAEMON_QUEUE_SIZE", "50")))
+        self.summaries = queue.Queue()
+        self._stop = threading.Event()
+        self._threads = []
+        self._texts = SimHashIndex(crew.dedup.max_distance)
+        self._texts_lock = threading.Lock()
+
+    # --- produtor ---
+
+    def poll_once(self) -> int:
+        """Busca os tópicos e enfileira os artigos ainda não vistos; retorna quantos foram enfileirados."""
+        with metrics.span("daemon.poll"):
+            # Uma página por tópico (a cota mensal é o limite) e nada do cache além do intervalo entre
+            # buscas: uma resposta de 6h atrás esconderia os artigos publicados desde a última rodada
+            results = self.crew.tools['browser'].search_many(
+                list(self.crew.topics), max_results=self.results_per_topic, page_size=self.results_per_topic,
+                max_age=self.poll_interval,
+            )
+            articles = self.crew.dedup.dedupe_urls(self.crew._tag(results))
+            fresh = self.store.claim(articles)
+        print(f"🛰️  {len(fresh)} artigo(s) novo(s) de {len(articles)} encontrados.")
+        for article in fresh:
+            while not self._stop.is_set():
+                try:
+                    self.articles.put(article, timeout=1)
+                    break
+                except queue.Full:
+                    continue
+        metrics.incr("daemon_enqueued", len(fresh))
+        return len(fresh)
+
+    def _producer(self):
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+                self.store.purge()
+            except Exception as e:
+                print(f"⚠️  Erro na busca periódica: {e}")
+            self._stop.wait(self.poll_interval)
+
+    # --- workers ---
+
+    def _is_duplicate(self, text_fp: int) -> bool:
+        # Mesma matéria já pronta (ou enviada) vinda de outro veículo
+        with self._texts_lock:
+            return self._texts.find(text_fp) is not None
+
+    def _admit_ready(self, items: List[dict]) -> tuple:
+        """Separa (prontos, duplicados): a impressão do texto só entra no índice quando o item fica pronto."""
+        ready, duplicates = [], []
+        with self._texts_lock:
+            for item in items:
+                text_fp = item.get('text_fp')
+                if text_fp is not None and self._texts.find(text_fp) is not None:
+                    duplicates.append(item)
+                    continue
+                if text_fp is not None:
+                    self._texts.add(text_fp, item['canonical_url'])
+                ready.append(item)
+        return ready, duplicates
+
+    def process(self, article: dict) -> Optional[dict]:
+        """Raspa e resume um artigo (None se ele for pulado)."""
+        summary_tool = self.crew.tools['summary']
+        with metrics.span("daemon.article"):
+            text, error = summary_tool.extract(article['url'])
+            if error:
+                metrics.incr("skips", reason="fetch_error")
+                return None
+            text_fp = simhash(text)
+            if text_fp is not None and self._is_duplicate(text_fp):
+                metrics.incr("skips", reason="duplicate_text")
+                self.store.mark_duplicate([article['canonical_url']])
+                return None
+            summary = summary_tool.summarize_text(article['url'], text)
+            if self.crew._is_summary_error(summary):
+                metrics.incr("skips", reason="summary_error")
+                return None
+        return {**article, 'text_fp': text_fp, 'summary': summary}
+
+    def _summary_worker(self):
+        while not self._stop.is_set():
+            try:
+                article = self.articles.get(timeout=1)
+            except queue.Empty:
+                continue
+            try:
+                # Preparação antecipada: cede a cota do LLM a execuções interativas no mesmo processo
+                with priority(PRIORITY_LOW):
+                    item = self.process(article)
+            except Exception as e:
+                print(f"   ❌ Erro ao processar {article['url']}: {e}")
+                item = None
+            if item is None:
+                self.store.mark_failed(article['canonical_url'])
+            else:
+                self.summaries.put(item)
+            self.articles.task_done()
+
+    def _translation_worker(self):
+        while not self._stop.is_set():
+            try:
+                batch = [self.summaries.get(timeout=1)]
+            except queue.Empty:
+                continue
+            # Espera um pouco para traduzir vários resumos na mesma requisição
+            deadline = time.monotonic() + self.translation_wait
+            while len(batch) < self.translation_batch:
+                try:
+                    batch.append(self.summaries.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                self.translate_batch(batch)
+            except Exception as e:
+                # Erro inesperado (estoque, tradutor): o lote volta para a fila em vez de derrubar o worker
+                print(f"   ❌ Erro ao traduzir um lote de {len(batch)} resumo(s): {e}")
+                metrics.incr("translation_errors")
+                try:
+                    self._retry_translation(batch)
+                except Exception as retry_error:
+                    print(f"   ❌ Não foi possível devolver o lote à fila: {retry_error}")
+            finally:
+                for _ in batch:
+                    self.summaries.task_done()
+
+    def translate_batch(self, items: List[dict]):
+        with metrics.span("daemon.translate", items=len(items)):
+            translated, ok = self.crew._translate_summaries(items)
+        # Falhas de tradução (inteiras ou em parte) devolvem inglês: esses itens não ficam prontos
+        ready, failed = [], []
+        for item, result, complete in zip(items, translated, ok):
+            if complete:
+                ready.append(result)
+            else:
+                failed.append(item)
+        for item in ready:
+            self._translation_attempts.pop(item['canonical_url'], None)
+        # Cópias da mesma matéria resumidas ao mesmo tempo: só a primeira a ficar pronta é mantida
+        ready, duplicates = self._admit_ready(ready)
+        if duplicates:
+            metrics.incr("skips", len(duplicates), reason="duplicate_text")
+            self.store.mark_duplicate([item['canonical_url'] for item in duplicates])
+        if ready:
+            self.store.mark_ready(ready)
+            metrics.incr("daemon_ready", len(ready))
+        if failed:
+            self._retry_translation(failed)
+        print(f"📦 {len(ready)} artigo(s) pronto(s) para envio. Estoque: {self.store.counts()}")
+
+    def _retry_translation(self, items: List[dict]):
+        """Devolve os itens à fila de tradução; após `translation_retries` tentativas, o artigo fica para uma nova busca."""
+        for item in items:
+            url = item['canonical_url']
+            attempts = self._translation_attempts.get(url, 0) + 1
+            if attempts >= self.translation_retries:
+                self._translation_attempts.pop(url, None)
+                self.store.mark_failed(url)
+                metrics.incr("skips", reason="translation_error")
+            else:
+                self._translation_attempts[url] = attempts
+                self.summaries.put(item)
+                metrics.incr("retries", kind="daemon_translation")
+        if self._translation_attempts:
+            # Dá um respiro ao tradutor (fora do ar, limite de requisições) antes da próxima tentativa
+            self._stop.wait(self.translation_wait)
+
+    # --- envio ---
+
+    def send(self, recipients: List[str] = None) -> str:
+        """Seleciona os itens prontos, monta o HTML e entrega (sem buscar, resumir ou traduzir nada)."""
+        recipients = recipients or self.crew.recipients
+        with metrics.span("daemon.send"):
+            items = self.store.select(self.per_section, self.max_item_age)
+            if not items:
+                return "❌ Nenhum artigo pronto para envio."
+            html_content = self.crew._build_html(items)
+            delivered = self.crew._send(html_content, recipients)
+        if not delivered:
+            return f"❌ Newsletter montada com {len(items)} artigos prontos, mas não foi enviada."
+        self.store.mark_sent([item['canonical_url'] for item in items])
+        self.crew.dedup.remember(items)
+        metrics.incr("articles_sent", len(items))
+        return f"✅ Newsletter enviada para {len(delivered)}/{len(recipients)} destinatários com {len(items)} artigos prontos."
+
+    def _scheduler(self):
+        while not self._stop.is_set():
+            when = next_send_time(self.send_at)
+            print(f"🗓️  Próximo envio: {when:%a %d/%m %H:%M}")
+            if self._stop.wait(max(0.0, (when - datetime.now()).total_seconds())):
+                return
+            print(self.send())
+
+    # --- ciclo de vida ---
+
+    def start(self):
+        released = self.store.release_pending()
+        if released:
+            print(f"♻️  {released} artigo(s) pendente(s) de uma execução anterior voltam para a fila.")
+        for url, text_fp in self.store.ready_fingerprints():
+            self._texts.add(text_fp, url)
+
+        targets = [self._producer, self._translation_worker] + [self._summary_worker] * self.workers
+        if self.send_at and self.crew.recipients:
+            targets.append(self._scheduler)
+        for target in targets:
+            thread = threading.Thread(target=target, name=f"daemon-{target.__name__.strip('_')}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"🤖 Daemon iniciado: busca a cada {self.poll_interval:.0f}s, {self.workers} worker(s) de resumo, "
+              f"fila de até {self.articles.maxsize} artigos.")
+        return self
+
+    def stop(self, timeout: float = 30):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def run_forever(self):
+        # SIGTERM (systemd, docker stop) encerra como Ctrl+C
+        signal.signal(signal.SIGTERM, lambda *_: self._stop.set())
+        self.start()
+        try:
+            while not self._stop.wait(1):
+                pass
+        except KeyboardInterrupt:
+            print("\n🛑 Encerrando o daemon...")
+        finally:
+            self.stop()
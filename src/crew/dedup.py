@@ -0,0 +1,225 @@
+# src/crew/dedup.py
+import hashlib
+import os
+import re
+import threading
+import time
+from typing import List, Optional
+
+from src.tools.metrics import metrics
+from src.tools.storage import cache_path, connect
+from src.tools.url_utils import canonicalize_url
+
+FINGERPRINT_BITS = 64
+# 4 faixas de 16 bits: duas impressões a até 3 bits de distância sempre compartilham uma faixa
+BANDS = 4
+BAND_BITS = FINGERPRINT_BITS // BANDS
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+# Sufixos como " - The Verge" ou " | Reuters" que os agregadores acrescentam aos títulos
+_TITLE_SOURCE_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{1,40}$")
+
+def normalize_title(title: str) -> str:
+    return _TITLE_SOURCE_SUFFIX.sub("", title or "").lower().strip()
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+def simhash(text: str, shingle_size: int = 3) -> Optional[int]:
+    """Impressão SimHash de 64 bits sobre shingles de palavras (None para texto vazio)."""
+    words = _WORD.findall(text.lower())
+    if not words:
+        return None
+    size = min(shingle_size, len(words))
+    weights = [0] * FINGERPRINT_BITS
+    for i in range(len(words) - size + 1):
+        h = _hash64(" ".join(words[i:i + size]))
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+class SimHashIndex:
+    """Índice compacto em memória para busca de impressões próximas (distância de Hamming)."""
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = max_distance
+        self._bands = [dict() for _ in range(BANDS)]
+
+    @staticmethod
+    def _band_keys(fingerprint: int):
+        mask = (1 << BAND_BITS) - 1
+        return [(fingerprint >> (i * BAND_BITS)) & mask for i in range(BANDS)]
+
+    def add(self, fingerprint: int, item):
+        for band, key in zip(self._bands, self._band_keys(fingerprint)):
+            band.setdefault(key, []).append((fingerprint, item))
+
+    def find(self, fingerprint: int):
+        """Retorna o primeiro item próximo o suficiente, ou None."""
+        for band, key in zip(self._bands, self._band_keys(fingerprint)):
+            for candidate, item in band.get(key, ()):
+                if hamming(candidate, fingerprint) <= self.max_distance:
+                    return item
+        return None
+
+class SentStoriesStore:
+    """Histórico persistente das matérias já enviadas (URL canônica e impressões de título e texto)."""
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv("DEDUP_HISTORY_PATH") or cache_path("sent_stories.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect(self.path)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sent_stories (
+                    url TEXT PRIMARY KEY,
+                    title_fp TEXT,
+                    text_fp TEXT,
+                    sent_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def recent(self, max_age: float) -> list:
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT url, title_fp, text_fp FROM sent_stories WHERE sent_at >= ?", (time.time() - max_age,)
+            ).fetchall()
+        parse = lambda fp: int(fp, 16) if fp else None
+        return [(url, parse(title_fp), parse(text_fp)) for url, title_fp, text_fp in rows]
+
+    def add_many(self, stories: list):
+        now = time.time()
+        fmt = lambda fp: format(fp, "016x") if fp is not None else None
+        with self._lock:
+            db = self._db()
+            db.executemany(
+                "INSERT OR REPLACE INTO sent_stories (url, title_fp, text_fp, sent_at) VALUES (?, ?, ?, ?)",
+                [(url, fmt(title_fp), fmt(text_fp), now) for url, title_fp, text_fp in stories],
+            )
+            db.commit()
+
+class ArticleDeduplicator:
+    """Remove artigos repetidos em duas passadas: URLs/títulos antes do download e texto antes do resumo.
+
+    Matérias enviadas nas últimas `DEDUP_HISTORY_DAYS` também são suprimidas.
+    """
+
+    def __init__(self, store: SentStoriesStore = None, max_distance: int = None, history_days: float = None):
+        self.store = store or SentStoriesStore()
+        self.max_distance = max_distance if max_distance is not None else int(os.getenv("DEDUP_MAX_DISTANCE", "3"))
+        self.history_days = history_days if history_days is not None else float(os.getenv("DEDUP_HISTORY_DAYS", "28"))
+        self._history = None
+
+    def _load_history(self):
+        # Índices do histórico carregados uma única vez por execução
+        if self._history is None:
+            urls, titles, texts = set(), SimHashIndex(self.max_distance), SimHashIndex(self.max_distance)
+            for url, title_fp, text_fp in self.store.recent(self.history_days * 86400):
+                urls.add(url)
+                if title_fp is not None:
+                    titles.add(title_fp, url)
+                if text_fp is not None:
+                    texts.add(text_fp, url)
+            self._history = (urls, titles, texts)
+        return self._history
+
+    def already_sent(self, article: dict) -> bool:
+        """Se a matéria (URL canônica, título ou texto) já saiu em uma edição do período de histórico."""
+        seen_urls, seen_titles, seen_texts = self._load_history()
+        canonical = article.get('canonical_url') or canonicalize_url(article['url'])
+        title_fp = article.get('title_fp')
+        if title_fp is None:
+            title_fp = simhash(normalize_title(article.get('title', '')), shingle_size=1)
+        text_fp = article.get('text_fp')
+        return (
+            canonical in seen_urls
+            or (title_fp is not None and seen_titles.find(title_fp) is not None)
+            or (text_fp is not None and seen_texts.find(text_fp) is not None)
+        )
+
+    def dedupe_urls(self, articles: List[dict]) -> List[dict]:
+        """Primeira passada (antes do download): URL canônica e título quase idêntico."""
+        seen_urls, seen_titles, _ = self._load_history()
+        batch_urls, batch_titles = set(), SimHashIndex(self.max_distance)
+        kept = []
+        for article in articles:
+            canonical = canonicalize_url(article['url'])
+            title_fp = simhash(normalize_title(article.get('title', '')), shingle_size=1)
+            if canonical in batch_urls:
+                metrics.incr("skips", reason="duplicate_url")
+                print(f"   🔁 URL duplicada removida: {article['url']}")
+                continue
+            if canonical in seen_urls:
+                metrics.incr("skips", reason="already_sent")
+                print(f"   📭 Já enviada em edições anteriores: {article['url']}")
+                continue
+            if title_fp is not None:
+                duplicate_of = batch_titles.find(title_fp)
+                if duplicate_of is not None:
+                    metrics.incr("skips", reason="duplicate_title")
+                    print(f"   🔁 Título quase idêntico a outro artigo removido: {article.get('title')}")
+                    continue
+                if seen_titles.find(title_fp) is not None:
+                    metrics.incr("skips", reason="already_sent")
+                    print(f"   📭 Título já enviado em edições anteriores: {article.get('title')}")
+                    continue
+                batch_titles.add(title_fp, canonical)
+            batch_urls.add(canonical)
+            kept.append({**article, 'canonical_url': canonical, 'title_fp': title_fp})
+        return kept
+
+    def text_gate(self):
+        """Versão incremental de `dedupe_texts` para artigos raspados em paralelo.
+
+        Retorna `admit(article)`, seguro entre threads: devolve o artigo com `text_fp`, ou None se o
+        texto repete um artigo já admitido (o primeiro a chegar fica) ou uma edição anterior.
+        """
+        _, _, seen_texts = self._load_history()
+        batch_texts = SimHashIndex(self.max_distance)
+        lock = threading.Lock()
+
+        def admit(article: dict) -> Optional[dict]:
+            text_fp = simhash(article.get('text', ''))
+            if text_fp is not None:
+                with lock:
+                    duplicate_of = batch_texts.find(text_fp)
+                    if duplicate_of is None and seen_texts.find(text_fp) is None:
+                        batch_texts.add(text_fp, article['url'])
+                if duplicate_of is not None:
+                    metrics.incr("skips", reason="duplicate_text")
+                    print(f"   🔁 Conteúdo quase idêntico a {duplicate_of} removido: {article['url']}")
+                    return None
+                if seen_texts.find(text_fp) is not None:
+                    metrics.incr("skips", reason="already_sent")
+                    print(f"   📭 Conteúdo já enviado em edições anteriores: {article['url']}")
+                    return None
+            return {**article, 'text_fp': text_fp}
+
+        return admit
+
+    def dedupe_texts(self, articles: List[dict]) -> List[dict]:
+        """Segunda passada (antes do resumo): texto extraído quase idêntico (mesma matéria em vários veículos)."""
+        admit = self.text_gate()
+        return [kept for kept in map(admit, articles) if kept is not None]
+
+    def remember(self, articles: List[dict]):
+        """Registra as matérias enviadas para suprimi-las nas próximas semanas."""
+        stories = [
+            (article.get('canonical_url') or canonicalize_url(article['url']), article.get('title_fp'), article.get('text_fp'))
+            for article in articles
+        ]
+        if stories:
+            self.store.add_many(stories)
+            self._history = None
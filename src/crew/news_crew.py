@@ -1,26 +1,105 @@
 # src/crew/news_crew.py
-from crewai import Crew, Process, Task
 from dotenv import load_dotenv
-from textwrap import dedent
-from deep_translator import GoogleTranslator
 load_dotenv()
 
-from src.agents.news_agents import NewsAgents
-from src.tools.browser_tools import news_search_tool
-from src.tools.email_tools import email_tool
-from src.tools.summary_tool import summary_tool
+# Apenas módulos leves aqui: crewai, langchain, bs4 etc. são importados na primeira utilização
+from src.crew.checkpoints import SENT, FAILED, CheckpointStore, current_window
+from src.crew.dedup import ArticleDeduplicator
+from src.crew.templates import render_article, render_page, render_section_header
+from src.tools.metrics import metrics
+from src.tools.translation import TranslationEngine
+import importlib
 import json
+import os
 import re # Precisamos do 're' para a extração do JSON
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+
+
+class _HostLimiter:
+    """Limita o número de requisições simultâneas por host."""
+
+    def __init__(self, max_per_host: int):
+        self.max_per_host = max(1, max_per_host)
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def for_url(self, url: str) -> threading.Semaphore:
+        host = (urlparse(url).hostname or "").lower()
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._semaphores[host]
+
+
+class _LazyTools(dict):
+    """Dicionário de ferramentas que só importa o módulo de cada ferramenta quando ela é usada."""
+    factories = {
+        "email": ("src.tools.email_tools", "email_tool"),
+        "browser": ("src.tools.browser_tools", "news_search_tool"),
+        "summary": ("src.tools.summary_tool", "summary_tool"),
+    }
+
+    def __missing__(self, key):
+        module_name, attribute = self.factories[key]
+        tool = getattr(importlib.import_module(module_name), attribute)
+        self[key] = tool
+        return tool
+
 
 class NewsCrew:
-    def __init__(self, recipient_email: str):
-        self.recipient_email = recipient_email
-        self.agents = NewsAgents()
-        self.tools = {
-            "email": email_tool,
-            "browser": news_search_tool,
-            "summary": summary_tool
-        }
+    # Limites do estágio de resumo (configuráveis via variáveis de ambiente)
+    max_workers: int = int(os.getenv("SUMMARY_MAX_WORKERS", "4"))
+    max_per_host: int = int(os.getenv("SUMMARY_MAX_PER_HOST", "2"))
+    article_timeout: float = float(os.getenv("SUMMARY_ARTICLE_TIMEOUT", "120"))
+
+    # Seleção por relevância: a busca traz `rank_overfetch` vezes mais candidatos por tópico e só os
+    # `rank_top_k` melhores são raspados e resumidos (RANKER_OVERFETCH=1 desliga o ranking)
+    rank_top_k: int = int(os.getenv("RANKER_TOP_K", os.getenv("NEWSAPI_PAGE_SIZE", "3")))
+    rank_overfetch: int = int(os.getenv("RANKER_OVERFETCH", "5"))
+
+    # Consultas da NewsAPI e a seção da newsletter de cada uma
+    topics = {"technology trends": "tech", "user experience design UX": "ux"}
+
+    def __init__(self, recipient_email, run_id: str = None, resume: bool = False, incremental: bool = False,
+                 checkpoints: CheckpointStore = None):
+        # Aceita um único e-mail ou uma lista de assinantes
+        self.recipients = [recipient_email] if isinstance(recipient_email, str) else list(recipient_email)
+        self.recipient_email = self.recipients[0] if self.recipients else None
+        self._agents = None
+        self._ranker = None
+        self.tools = _LazyTools()
+        self.translator = TranslationEngine()
+        self.dedup = ArticleDeduplicator()
+        # Checkpoints por etapa: `resume` retoma uma execução interrompida e `incremental`
+        # reaproveita os resumos de outras execuções da mesma janela
+        self.checkpoints = checkpoints or CheckpointStore()
+        self.run_id = run_id
+        self.resume = resume
+        self.incremental = incremental
+
+    @property
+    def agents(self):
+        # Os agentes (e o cliente ChatGroq) só são criados quando alguma etapa precisar deles
+        if self._agents is None:
+            from src.agents.news_agents import NewsAgents
+            self._agents = NewsAgents()
+        return self._agents
+
+    @property
+    def ranker(self):
+        # numpy e o modelo de embeddings só são carregados se o ranking estiver ativo
+        if self._ranker is None:
+            from src.tools.ranker import ArticleRanker
+            self._ranker = ArticleRanker()
+        return self._ranker
+
+    @property
+    def search_limit(self):
+        """Resultados pedidos por tópico: candidatos extras para o ranking, ou o padrão da busca."""
+        return self.rank_top_k * self.rank_overfetch if self.rank_overfetch > 1 else None
 
     def _extract_json_from_string(self, text: str) -> list:
         # Esta função auxiliar encontra e extrai a primeira string JSON válida do texto
@@ -32,91 +111,328 @@ class NewsCrew:
                 return []
         return []
 
+    @staticmethod
+    def _is_summary_error(summary: str) -> bool:
+        # Mensagens de erro do SummaryTool indicam que o artigo deve ser pulado
+        return summary.startswith("Erro") or summary.startswith("Site") or "indisponível" in summary.lower()
+
+    def _run_concurrently(self, articles: list, work, host_limited: bool = False, then=None, on_result=None) -> list:
+        """Executa `work(article, deadline)` em paralelo e devolve os resultados na ordem original.
+
+        `deadline` é o instante (time.monotonic) em que o artigo estoura o prazo: o trabalho deve
+        desistir sozinho a partir dele, liberando a vaga do pool e do host. Com `host_limited`, só
+        `work` ocupa a vaga do host; `then(article, resultado, deadline)` continua o mesmo artigo
+        fora dela, sob o mesmo prazo. Falhas inesperadas e artigos que excedem o prazo ficam como
+        None; `on_result(article, result)` só é chamado, na thread principal, para os resultados aceitos.
+        """
+        results = [None] * len(articles)
+        started = {}
+        host_limiter = _HostLimiter(self.max_per_host) if host_limited else None
+
+        def task(index, article):
+            # O prazo do artigo conta do início real do trabalho (após a espera pelo limite do host)
+            if host_limiter is None:
+                started[index] = time.monotonic()
+                result = work(article, started[index] + self.article_timeout)
+            else:
+                with host_limiter.for_url(article['url']):
+                    started[index] = time.monotonic()
+                    result = work(article, started[index] + self.article_timeout)
+            if then is None:
+                return result
+            return then(article, result, started[index] + self.article_timeout)
+
+        executor = ThreadPoolExecutor(max_workers=max(1, self.max_workers))
+        try:
+            pending = {executor.submit(task, i, article): i for i, article in enumerate(articles)}
+            while pending:
+                done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = pending.pop(future)
+                    try:
+                        results[i] = future.result()
+                    except Exception as e:
+                        metrics.incr("skips", reason="exception")
+                        print(f"   ❌ ERRO inesperado ao processar o artigo {articles[i]['url']}. Erro: {e}")
+                        print(f"   ⏭️  Pulando artigo...")
+                        continue
+                    if on_result is not None:
+                        on_result(articles[i], results[i])
+
+                # Artigos que estouraram o prazo são descartados; o resultado tardio da thread é ignorado
+                now = time.monotonic()
+                for future, i in list(pending.items()):
+                    if i in started and now - started[i] > self.article_timeout:
+                        pending.pop(future)
+                        future.cancel()
+                        metrics.incr("skips", reason="timeout")
+                        print(f"   ⏱️  Artigo excedeu o prazo de {self.article_timeout:.0f}s ({articles[i]['url']}).")
+                        print(f"   ⏭️  Pulando artigo...")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results
+
+    def _summarize_articles(self, articles: list) -> list:
+        """Raspa, remove conteúdo repetido e resume os artigos em paralelo, preservando a ordem original.
+
+        Cada artigo segue sozinho de raspagem para resumo (sem esperar os downloads mais lentos), com
+        um único prazo para as duas etapas; o conteúdo repetido é filtrado na passagem de uma para a outra.
+        """
+        summary_tool = self.tools['summary']
+        admit = self.dedup.text_gate()
+
+        def summarize(article, extracted, deadline):
+            text, error = extracted
+            if error:
+                metrics.incr("skips", reason="fetch_error")
+                print(f"   ⚠️  Artigo inacessível ({article['url']}): {error}")
+                print(f"   ⏭️  Pulando artigo...")
+                return None
+            if time.monotonic() >= deadline:
+                # Artigo já descartado pelo prazo: não ocupa o lugar de uma cópia da mesma matéria
+                return None
+            article = admit({**article, 'text': text})
+            if article is None:
+                return None
+            summary = summary_tool.summarize_text(article['url'], text, deadline=deadline)
+            if self._is_summary_error(summary):
+                metrics.incr("skips", reason="summary_error")
+                print(f"   ⚠️  Não foi possível resumir ({article['url']}): {summary}")
+                print(f"   ⏭️  Pulando artigo...")
+                return None
+            article = {key: value for key, value in article.items() if key != 'text'}
+            return {**article, "summary": summary}
+
+        def checkpoint(article, summary):
+            if self.run_id and summary is not None:
+                # Gravado assim que fica pronto: uma falha depois disso não paga o LLM de novo
+                self.checkpoints.put(self.run_id, "summary", summary['canonical_url'], summary)
+
+        print(f"🌍 Raspando e resumindo {len(articles)} artigos...")
+        results = self._run_concurrently(
+            articles, lambda a, deadline: summary_tool.extract(a['url'], deadline=deadline), host_limited=True,
+            then=summarize, on_result=checkpoint,
+        )
+        summaries = [summary for summary in results if summary is not None]
+        for summary in summaries:
+            print(f"   ✅ Resumo gerado com sucesso: {summary['title']}")
+        return summaries
+
     def _translate_text(self, text: str) -> str:
         """Traduz texto do inglês para português brasileiro."""
+        return self.translator.translate(text)
+
+    def _translate_summaries(self, summaries: list) -> tuple:
+        """Traduz títulos e resumos de todos os artigos de uma vez (lotes + memória de tradução).
+
+        Retorna (resumos traduzidos, indicadores): o indicador é False quando parte do título ou do
+        resumo ficou sem tradução; esse artigo segue no texto disponível, mas deve ser traduzido de novo.
+        """
+        print(f"🌐 Traduzindo {len(summaries)} artigos...")
+        texts = [s['title'] for s in summaries] + [s['summary'] for s in summaries]
+        translated, complete = self.translator.translate_many_checked(texts)
+        translated_titles, translated_texts = translated[:len(summaries)], translated[len(summaries):]
+        
+        translated_summaries = []
+        for summary, translated_title, translated_summary_text in zip(summaries, translated_titles, translated_texts):
+            translated_summaries.append({
+                **summary,
+                'title': translated_title,
+                'summary': translated_summary_text,
+            })
+        ok = [title_ok and text_ok for title_ok, text_ok in zip(complete[:len(summaries)], complete[len(summaries):])]
+        print(f"   ✅ Tradução concluída!" if all(ok) else f"   ⚠️  Tradução incompleta em {ok.count(False)} artigo(s).")
+        return translated_summaries, ok
+
+    def _build_html(self, all_summaries: list) -> str:
+        # Separa por categoria para a montagem final
+        tech_articles_final = [s for s in all_summaries if s['category'] == 'tech']
+        ux_articles_final = [s for s in all_summaries if s['category'] == 'ux']
+        
+        print(f"🏗️  Montando HTML:")
+        print(f"   - {len(tech_articles_final)} artigos de tecnologia")
+        print(f"   - {len(ux_articles_final)} artigos de UX design")
+        
+        html_body_parts = []
+
+        # Adiciona a seção de Tecnologia
+        if tech_articles_final:
+            html_body_parts.append(render_section_header("Notícias de Tecnologia", first=True))
+        html_body_parts.extend(render_article(article) for article in tech_articles_final)
+        
+        # Adiciona a seção de UX Design
+        if ux_articles_final:
+            html_body_parts.append(render_section_header("Notícias de UX Design"))
+        html_body_parts.extend(render_article(article) for article in ux_articles_final)
+
+        return render_page("".join(html_body_parts))
+
+    def _send(self, html_content: str, recipients: list) -> list:
+        """Envia a newsletter e retorna os destinatários atendidos."""
+        print("📧 Enviando newsletter por e-mail...")
+        email_function = self.tools['email']
+        if len(recipients) == 1:
+            email_result = email_function._run(recipient_email=recipients[0], content=html_content)
+            print(f"📨 {email_result}")
+            return list(recipients) if email_result.startswith("Newsletter enviada com sucesso") else []
+
         try:
-            translator = GoogleTranslator(source='en', target='pt')
-            # Dividir texto longo em chunks menores para evitar limite da API
-            if len(text) > 500:
-                # Dividir por sentenças
-                sentences = text.split('. ')
-                translated_sentences = []
-                for sentence in sentences:
-                    if sentence.strip():
-                        translated = translator.translate(sentence.strip())
-                        translated_sentences.append(translated)
-                return '. '.join(translated_sentences)
-            else:
-                return translator.translate(text)
-        except Exception as e:
-            print(f"⚠️  Erro na tradução: {e}")
-            return text  # Retorna texto original se tradução falhar
+            batch_results = email_function.send_bulk(recipients, html_content)
+        except ValueError as e:
+            print(f"📨 Erro: {e}")
+            return []
+        delivered = [recipient for r in batch_results if r.ok for recipient in r.recipients]
+        print(f"📨 Newsletter enviada para {len(delivered)}/{len(recipients)} destinatários em {len(batch_results)} lote(s).")
+        for r in batch_results:
+            if not r.ok:
+                print(f"   ⚠️  Lote {r.index + 1} falhou após {r.attempts} tentativa(s). Status: {r.status_code}. Detalhes: {r.error}")
+        return delivered
+
+    def _begin_run(self) -> str:
+        """Escolhe a execução: retoma a indicada (ou a última não enviada) ou registra uma nova."""
+        if self.resume:
+            run_id = self.run_id or self.checkpoints.latest_unfinished()
+            info = self.checkpoints.run_info(run_id) if run_id else None
+            if info:
+                print(f"♻️  Retomando a execução {run_id} (janela {info['window']}, estado: {info['status']})")
+                self.run_id = run_id
+                return info['status']
+            print("⚠️  Nenhuma execução para retomar: iniciando uma nova.")
+
+        self.run_id = self.checkpoints.start_run(self.run_id)
+        print(f"🆔 Execução {self.run_id} (retome com --resume {self.run_id})")
+        if self.incremental:
+            self._seed_from_window()
+        return None
+
+    def _seed_from_window(self):
+        # Modo incremental: resumos de outras execuções da mesma janela entram nesta execução. Só as
+        # execuções que não enviaram contam, e matérias já enviadas (por qualquer edição) ficam de fora
+        previous = {}
+        for run_id in self.checkpoints.window_runs(current_window(), exclude=self.run_id, unsent_only=True):
+            previous.update(self.checkpoints.load(run_id, "summary"))
+        sent = [url for url, summary in previous.items() if self.dedup.already_sent(summary)]
+        for url in sent:
+            del previous[url]
+        if sent:
+            metrics.incr("skips", len(sent), reason="already_sent")
+            print(f"   📭 {len(sent)} resumo(s) da janela já enviados em edições anteriores ficaram de fora.")
+        if previous:
+            self.checkpoints.put_many(self.run_id, "summary", previous)
+            print(f"♻️  Modo incremental: {len(previous)} resumos desta janela reaproveitados.")
+
+    def _search(self) -> dict:
+        """Busca os tópicos ainda sem checkpoint nesta execução."""
+        results = self.checkpoints.load(self.run_id, "search")
+        missing = [query for query in self.topics if query not in results]
+        if len(missing) < len(self.topics):
+            metrics.incr("checkpoint_hits", len(self.topics) - len(missing), stage="search")
+            print(f"♻️  {len(self.topics) - len(missing)} busca(s) recuperada(s) do checkpoint.")
+        if missing:
+            print("🔍 Buscando notícias sobre tecnologia e UX design...")
+            # Uma única página por tópico, mesmo com os candidatos extras do ranking
+            fresh = self.tools['browser'].search_many(missing, max_results=self.search_limit, page_size=self.search_limit)
+            # Buscas vazias (erro ou cota) não são gravadas para serem repetidas na retomada
+            self.checkpoints.put_many(self.run_id, "search", {query: found for query, found in fresh.items() if found})
+            results.update(fresh)
+        return results
+
+    def _tag(self, results: dict) -> list:
+        """Marca cada artigo com a seção da consulta que o encontrou."""
+        return [{**article, 'category': category} for query, category in self.topics.items() for article in results.get(query, [])]
+
+    def _rank(self, articles: list) -> list:
+        """Mantém os `rank_top_k` artigos mais relevantes e diversos de cada seção."""
+        if self.rank_overfetch <= 1:
+            return articles
+        by_query = {query: [a for a in articles if a['category'] == category] for query, category in self.topics.items()}
+        ranked = self.ranker.top_k(by_query, self.rank_top_k)
+        return [article for query in self.topics for article in ranked[query]]
+
+    def _merge_summaries(self, articles: list, fresh: list, stored: dict) -> list:
+        """Resumos novos e gravados na ordem original dos artigos (tech, depois ux)."""
+        by_url = {**stored, **{s['canonical_url']: s for s in fresh}}
+        ordered = [by_url[a['canonical_url']] for a in articles if a['canonical_url'] in by_url]
+        # Resumos trazidos pelo modo incremental sem artigo nesta busca vão para o fim
+        urls = {a['canonical_url'] for a in articles}
+        return ordered + [s for url, s in stored.items() if url not in urls]
+
+    def _translate_pending(self, summaries: list) -> list:
+        """Traduz apenas os artigos sem tradução gravada nesta execução."""
+        done = self.checkpoints.load(self.run_id, "translation")
+        pending = [s for s in summaries if s['canonical_url'] not in done]
+        if len(pending) < len(summaries):
+            metrics.incr("checkpoint_hits", len(summaries) - len(pending), stage="translation")
+            print(f"♻️  {len(summaries) - len(pending)} tradução(ões) recuperada(s) do checkpoint.")
+        if pending:
+            translated, ok = self._translate_summaries(pending)
+            # Traduções com falha (inteira ou em parte) ficam de fora do checkpoint para nova tentativa
+            done_now = {t['canonical_url']: t for t, complete in zip(translated, ok) if complete}
+            self.checkpoints.put_many(self.run_id, "translation", done_now)
+            done.update({t['canonical_url']: t for t in translated})
+        return [done[s['canonical_url']] for s in summaries]
 
     def run(self):
-        researcher = self.agents.make_researcher_agent()
-        summarizer = self.agents.make_summarizer_agent()
-        editor = self.agents.make_editor_agent()
+        status = self._begin_run()
+        if status == SENT and set(self.checkpoints.load(self.run_id, "send")) >= set(self.recipients):
+            return f"✅ A execução {self.run_id} já havia enviado a newsletter. Nada a fazer."
 
         # --- ETAPA 1: PESQUISA DIRECIONADA ---
         print("--- [Etapa 1/5] Pesquisando notícias... ---")
         
-        # Buscar notícias diretamente usando as funções
-        print("🔍 Buscando notícias sobre tecnologia...")
-        tech_results_str = self.tools['browser']._run("technology trends")
-        print("🔍 Buscando notícias sobre UX design...")
-        ux_results_str = self.tools['browser']._run("user experience design UX")
+        with metrics.span("stage.search"):
+            # Buscar todos os tópicos em paralelo (sessão compartilhada + cache de respostas)
+            results = self._search()
         
         # --- ETAPA 2: PROCESSAMENTO DOS RESULTADOS ---
         print("\n--- [Etapa 2/5] Processando resultados da pesquisa... ---")
         
-        # Usando a função auxiliar para extrair o JSON de forma segura da resposta
-        tech_articles = self._extract_json_from_string(tech_results_str)
-        ux_articles = self._extract_json_from_string(ux_results_str)
-        
-        print(f"📰 Encontradas {len(tech_articles)} notícias de tecnologia:")
-        for i, article in enumerate(tech_articles, 1):
-            print(f"  {i}. {article.get('title', 'Título não disponível')}")
+        with metrics.span("stage.process"):
+            tagged = self._tag(results)
+            tech_articles = [a for a in tagged if a['category'] == 'tech']
+            ux_articles = [a for a in tagged if a['category'] == 'ux']
             
-        print(f"📰 Encontradas {len(ux_articles)} notícias de UX:")
-        for i, article in enumerate(ux_articles, 1):
-            print(f"  {i}. {article.get('title', 'Título não disponível')}")
-        
-        articles = tech_articles + ux_articles
+            print(f"📰 Encontradas {len(tech_articles)} notícias de tecnologia:")
+            for i, article in enumerate(tech_articles, 1):
+                print(f"  {i}. {article.get('title', 'Título não disponível')}")
+                
+            print(f"📰 Encontradas {len(ux_articles)} notícias de UX:")
+            for i, article in enumerate(ux_articles, 1):
+                print(f"  {i}. {article.get('title', 'Título não disponível')}")
+            
+            # Remove URLs repetidas (inclusive variações com parâmetros de rastreamento) e matérias já enviadas
+            print("🧹 Removendo artigos duplicados...")
+            articles = self.dedup.dedupe_urls(tech_articles + ux_articles)
+            metrics.incr("articles_found", len(tech_articles) + len(ux_articles))
+
+            # Só os candidatos mais relevantes seguem para a raspagem e o resumo
+            articles = self._rank(articles)
 
-        if not articles:
+            # Artigos já resumidos nesta execução (retomada) ou na mesma janela (incremental) não são refeitos
+            stored = self.checkpoints.load(self.run_id, "summary")
+            pending = [a for a in articles if a['canonical_url'] not in stored]
+            if len(pending) < len(articles):
+                metrics.incr("checkpoint_hits", len(articles) - len(pending), stage="summary")
+                print(f"♻️  {len(articles) - len(pending)} artigo(s) já resumido(s); {len(pending)} novo(s).")
+
+        if not pending and not stored:
             print("❌ Nenhum artigo foi encontrado ou processado. Encerrando.")
+            self.checkpoints.set_status(self.run_id, FAILED)
             return
 
         print(f"\n✅ {len(articles)} artigos encontrados e processados com sucesso.")
 
         # --- ETAPA 3: RESUMO DOS ARTIGOS (COM TRATAMENTO DE ERRO) ---
         print("\n--- [Etapa 3/5] Resumindo artigos... ---")
-        summaries = []
-        for i, article in enumerate(articles):
-            print(f"\n📝 Resumindo artigo {i+1}/{len(articles)}:")
-            print(f"   Título: {article['title']}")
-            print(f"   URL: {article['url']}")
-            try:
-                # Usar a ferramenta de resumo diretamente
-                summary = self.tools['summary']._run(article['url'])
-                category = "tech" if i < len(tech_articles) else "ux"
-                
-                # Verificar se o resumo contém erro
-                if summary.startswith("Erro") or summary.startswith("Site") or "indisponível" in summary.lower():
-                    print(f"   ⚠️  Artigo inacessível: {summary}")
-                    print(f"   ⏭️  Pulando artigo...")
-                    continue  # Pular este artigo completamente
-                else:
-                    summaries.append({"title": article['title'], "summary": summary, "url": article['url'], "category": category})
-                    print(f"   ✅ Resumo gerado com sucesso!")
-                    
-            except Exception as e:
-                print(f"   ❌ ERRO inesperado ao resumir o artigo. Erro: {e}")
-                print(f"   ⏭️  Pulando artigo...")
-                continue
+        print(f"⚙️  Concorrência: {self.max_workers} global, {self.max_per_host} por host, prazo de {self.article_timeout:.0f}s por artigo")
+        with metrics.span("stage.summarize"):
+            fresh = self._summarize_articles(pending) if pending else []
+            summaries = self._merge_summaries(articles, fresh, stored)
         
         if not summaries:
             print("❌ Nenhum resumo pode ser gerado. Encerrando.")
+            self.checkpoints.set_status(self.run_id, FAILED)
             return
 
         # Contar resumos válidos
@@ -126,78 +442,38 @@ class NewsCrew:
         # --- ETAPA 4: TRADUÇÃO E EDIÇÃO ---
         print("\n--- [Etapa 4/5] Traduzindo títulos e resumos para português... ---")
         
-        if not summaries:
-            print("❌ Nenhum artigo válido para traduzir. Encerrando.")
-            return "Nenhum artigo válido foi encontrado para a newsletter."
-        
-        # Traduzir todos os títulos e resumos
-        translated_summaries = []
-        for i, summary in enumerate(summaries):
-            print(f"🌐 Traduzindo artigo {i+1}/{len(summaries)}: {summary['title'][:50]}...")
-            
-            # Traduzir título
-            translated_title = self._translate_text(summary['title'])
-            
-            # Traduzir resumo
-            translated_summary_text = self._translate_text(summary['summary'])
-            
-            translated_summaries.append({
-                'title': translated_title,
-                'summary': translated_summary_text,
-                'url': summary['url'],
-                'category': summary['category']
-            })
-            print(f"   ✅ Tradução concluída!")
-        
-        # Atualizar summaries com versões traduzidas
-        summaries = translated_summaries
+        with metrics.span("stage.translate"):
+            # Atualizar summaries com versões traduzidas
+            summaries = self._translate_pending(summaries)
         
         print(f"📰 Newsletter preparada com {len(summaries)} artigos traduzidos.")
 
         # --- ETAPA 5: GERAÇÃO DO HTML E ENVIO ---
         print("\n--- [Etapa 5/5] Montando o HTML e Enviando a Newsletter Final ---")
         
-        html_body_parts = []
-        
         # Usar todos os resumos (agora todos são válidos)
         all_summaries = summaries
 
-        # Separa por categoria para a montagem final
-        tech_articles_final = [s for s in all_summaries if s['category'] == 'tech']
-        ux_articles_final = [s for s in all_summaries if s['category'] == 'ux']
+        with metrics.span("stage.send"):
+            html_content = self._build_html(all_summaries)
+            # Na retomada, só quem ainda não recebeu esta edição
+            already_sent = self.checkpoints.load(self.run_id, "send")
+            recipients = [r for r in self.recipients if r not in already_sent]
+            if already_sent:
+                print(f"♻️  {len(self.recipients) - len(recipients)} destinatário(s) já atendido(s) nesta execução.")
+            delivered = self._send(html_content, recipients) if recipients else []
+            self.checkpoints.put_many(self.run_id, "send", {r: {"sent_at": time.time()} for r in delivered})
         
-        print(f"🏗️  Montando HTML:")
-        print(f"   - {len(tech_articles_final)} artigos de tecnologia")
-        print(f"   - {len(ux_articles_final)} artigos de UX design")
-        
-        # Adiciona a seção de Tecnologia
-        for article in tech_articles_final:
-             html_body_parts.append(f"""<tr><td style="padding: 15px 0; border-bottom: 1px solid #eeeeee;"><a href="{article['url']}" style="text-decoration: none;"><h3 style="font-family: Arial, sans-serif; font-size: 24px; font-weight: bold; color: #363737; margin-bottom: 5px;">{article['title']}</h3></a><p style="font-size: 16px; color: #555555; line-height: 1.5; margin-top: 5px;">{article['summary']}</p></td></tr>""")
-        
-        # Adiciona a seção de UX Design
-        if ux_articles_final:
-            html_body_parts.insert(len(tech_articles_final), '<tr><td style="padding: 20px 0 10px 0;"><h2 style="color: #363737; border-bottom: 2px solid #363737; padding-bottom: 5px;">Notícias de UX Design</h2></td></tr>')
-        for article in ux_articles_final:
-             html_body_parts.append(f"""<tr><td style="padding: 15px 0; border-bottom: 1px solid #eeeeee;"><a href="{article['url']}" style="text-decoration: none;"><h3 style="font-family: Arial, sans-serif; font-size: 24px; font-weight: bold; color: #363737; margin-bottom: 5px;">{article['title']}</h3></a><p style="font-size: 16px; color: #555555; line-height: 1.5; margin-top: 5px;">{article['summary']}</p></td></tr>""")
+        if len(delivered) < len(recipients):
+            self.checkpoints.set_status(self.run_id, FAILED)
+            if not delivered:
+                return f"❌ Newsletter gerada com {len(all_summaries)} artigos, mas não foi enviada. Retome com --resume {self.run_id}."
+            return (f"⚠️  Newsletter enviada para {len(delivered)}/{len(recipients)} destinatários. "
+                    f"Retome com --resume {self.run_id} para reenviar aos demais.")
 
-        newsletter_html_body = "".join(html_body_parts)
-        
-        # Adiciona o cabeçalho de Tecnologia se houver notícias de tecnologia
-        if tech_articles_final:
-            newsletter_html_body = '<tr><td style="padding: 10px 0;"><h2 style="color: #363737; border-bottom: 2px solid #363737; padding-bottom: 5px;">Notícias de Tecnologia</h2></td></tr>' + newsletter_html_body
-
-        html_content = f"""
-        <html><head><style>body {{ font-family: Arial, sans-serif; }}</style></head><body>
-        <table width="100%" border="0" cellspacing="0" cellpadding="0"><tr><td align="center">
-        <table width="40%" border="0" cellspacing="0" cellpadding="20" style="max-width: 600px; min-width: 400px; border-collapse: collapse;">
-            <tr><td align="center" style="padding: 20px 0;"><h1 style="font-size: 28px; color: #363737;">Seu Resumo Semanal sobre Design e Tecnologia</h1></td></tr>
-            {newsletter_html_body}
-        </table></td></tr></table></body></html>
-        """
-        
-        print("📧 Enviando newsletter por e-mail...")
-        email_function = self.tools['email']
-        email_result = email_function._run(recipient_email=self.recipient_email, content=html_content)
-        print(f"📨 {email_result}")
+        # Matérias enviadas não voltam nas próximas edições
+        self.checkpoints.set_status(self.run_id, SENT)
+        self.dedup.remember(all_summaries)
+        metrics.incr("articles_sent", len(all_summaries))
         
-        return f"✅ Processo concluído. Newsletter gerada com {len(all_summaries)} artigos e enviada com sucesso."
\ No newline at end of file
+        return f"✅ Processo concluído. Newsletter gerada com {len(all_summaries)} artigos e enviada com sucesso."
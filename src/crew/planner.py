@@ -0,0 +1,208 @@
+# src/crew/planner.py
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from src.crew.dedup import ArticleDeduplicator
+from src.crew.news_crew import NewsCrew
+from src.crew.templates import PAGE_TITLE, render_article, render_page, render_section_header
+from src.tools.metrics import metrics
+from src.tools.storage import KeyValueStore, cache_path
+from src.tools.translation import TranslationEngine, get_backend
+from src.tools.url_utils import canonicalize_url
+
+# Títulos das seções conhecidas (os demais tópicos usam "News: <tópico>" traduzido)
+SECTION_TITLES_PT = {
+    "technology trends": "Notícias de Tecnologia",
+    "user experience design UX": "Notícias de UX Design",
+}
+SECTION_TITLES_EN = {
+    "technology trends": "Technology News",
+    "user experience design UX": "UX Design News",
+}
+PAGE_TITLE_EN = "Your Weekly Design and Technology Digest"
+
+@dataclass
+class Subscriber:
+    email: str
+    topics: List[str] = field(default_factory=lambda: list(SECTION_TITLES_EN))
+    language: str = "pt"
+
+def load_subscribers(path: str) -> List[Subscriber]:
+    """Lê assinantes de um JSON: [{"email": ..., "topics": [...], "language": "pt"}, ...]."""
+    with open(path, encoding="utf-8") as f:
+        return [Subscriber(**entry) for entry in json.load(f)]
+
+class FragmentCache:
+    """Fragmentos HTML já traduzidos e renderizados, por artigo e idioma (compartilhados entre assinantes e execuções)."""
+
+    def __init__(self, path: str = None, ttl: float = None):
+        self.path = path or os.getenv("FRAGMENT_CACHE_PATH") or cache_path("fragments.sqlite3")
+        self.ttl = ttl if ttl is not None else float(os.getenv("FRAGMENT_CACHE_TTL", str(7 * 86400)))
+        self.store = KeyValueStore(self.path, "fragments", value_column="html", ttl=self.ttl)
+
+    @staticmethod
+    def make_key(article: dict, language: str, backend: str) -> str:
+        # O conteúdo de origem faz parte da chave: um resumo novo gera um fragmento novo; o tradutor
+        # também, para que fragmentos do tradutor falso nunca cheguem a leitores reais
+        source = json.dumps([article['canonical_url'], article['url'], article['title'], article['summary']], ensure_ascii=False)
+        return hashlib.sha256(f"{backend}|{language}|{source}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        return self.store.get_many(keys)
+
+    def put_many(self, fragments: Dict[str, str]):
+        self.store.put_many(fragments)
+
+class NewsletterPlanner:
+    """Atende vários assinantes com mixes de tópicos e idiomas diferentes sem repetir trabalho.
+
+    Busca a união dos tópicos, resume cada artigo distinto uma única vez, traduz e renderiza cada
+    artigo uma vez por idioma (`FragmentCache`) e monta a newsletter de cada grupo de assinantes
+    com a mesma combinação de tópicos e idioma a partir desses fragmentos, com um envio em massa por grupo.
+    """
+
+    def __init__(self, subscribers: List[Subscriber], crew=None, fragments: FragmentCache = None, per_section: int = None):
+        self.subscribers = subscribers
+        self.crew = crew or NewsCrew([s.email for s in subscribers])
+        # O histórico global de matérias enviadas não vale aqui: o que um assinante recebeu
+        # pode ser novidade para outro
+        self.crew.dedup = ArticleDeduplicator(history_days=0)
+        self.fragments = fragments or FragmentCache()
+        self.per_section = per_section or int(os.getenv("NEWSLETTER_ITEMS_PER_SECTION", "3"))
+        self._translators = {self.crew.translator.backend.target: self.crew.translator}
+
+    def topics(self) -> List[str]:
+        """União dos tópicos de todos os assinantes, na ordem em que aparecem."""
+        return list(dict.fromkeys(topic for s in self.subscribers for topic in s.topics))
+
+    def languages(self) -> List[str]:
+        return list(dict.fromkeys(s.language for s in self.subscribers))
+
+    def _translator(self, language: str) -> TranslationEngine:
+        if language not in self._translators:
+            self._translators[language] = TranslationEngine(backend=get_backend(target=language))
+        return self._translators[language]
+
+    def _translate(self, texts: List[str], language: str) -> List[str]:
+        return self._translate_checked(texts, language)[0]
+
+    def _translate_checked(self, texts: List[str], language: str) -> tuple:
+        """(traduções, indicadores de tradução completa por texto)."""
+        if language == "en":
+            return list(texts), [True] * len(texts)
+        return self._translator(language).translate_many_checked(texts)
+
+    def _collect(self, results: Dict[str, List[dict]]) -> List[dict]:
+        # Um registro por URL canônica, com todos os tópicos que a encontraram
+        by_url = {}
+        for topic, articles in results.items():
+            for article in articles:
+                key = canonicalize_url(article['url'])
+                if key in by_url:
+                    if topic not in by_url[key]['topics']:
+                        by_url[key]['topics'].append(topic)
+                else:
+                    by_url[key] = {**article, 'topics': [topic]}
+        return self.crew.dedup.dedupe_urls(list(by_url.values()))
+
+    def _render_fragments(self, summaries: List[dict], language: str) -> Dict[str, str]:
+        """HTML de cada artigo no idioma: do cache quando possível; os demais são traduzidos em lote e renderizados."""
+        # Em inglês o texto não passa pelo tradutor
+        backend = "none" if language == "en" else self._translator(language).backend.name
+        keys = {s['canonical_url']: self.fragments.make_key(s, language, backend) for s in summaries}
+        cached = self.fragments.get_many(list(set(keys.values())))
+        missing = [s for s in summaries if keys[s['canonical_url']] not in cached]
+        metrics.incr("cache_hits", len(summaries) - len(missing), cache="fragment")
+        metrics.incr("cache_misses", len(missing), cache="fragment")
+
+        rendered, failed = {}, set()
+        if missing:
+            translated, complete = self._translate_checked([s['title'] for s in missing] + [s['summary'] for s in missing], language)
+            titles, texts = translated[:len(missing)], translated[len(missing):]
+            for i, (article, title, text) in enumerate(zip(missing, titles, texts)):
+                key = keys[article['canonical_url']]
+                rendered[key] = render_article({**article, 'title': title, 'summary': text})
+                if not (complete[i] and complete[len(missing) + i]):
+                    failed.add(key)  # tradução falhou (inteira ou em parte): usa o que há agora, mas não guarda no cache
+            self.fragments.put_many({key: html for key, html in rendered.items() if key not in failed})
+        print(f"🧩 [{language}] {len(summaries) - len(missing)} fragmento(s) do cache, {len(missing)} renderizado(s).")
+        return {url: cached.get(key) or rendered[key] for url, key in keys.items()}
+
+    def _chrome(self, topics: List[str], language: str) -> dict:
+        """Título da newsletter e das seções no idioma."""
+        if language == "pt":
+            known = {t: SECTION_TITLES_PT[t] for t in topics if t in SECTION_TITLES_PT}
+            others = [t for t in topics if t not in known]
+            translated = self._translate([f"News: {t}" for t in others], language)
+            return {"page": PAGE_TITLE, "sections": {**known, **dict(zip(others, translated))}}
+        english = [PAGE_TITLE_EN] + [SECTION_TITLES_EN.get(t, f"News: {t}") for t in topics]
+        translated = self._translate(english, language)
+        return {"page": translated[0], "sections": dict(zip(topics, translated[1:]))}
+
+    def _assemble(self, topics: List[str], summaries: List[dict], fragments: Dict[str, str], chrome: dict) -> tuple:
+        """Monta a newsletter de uma combinação de tópicos; retorna (html, número de artigos)."""
+        parts, used = [], set()
+        for topic in topics:
+            items = [s for s in summaries if topic in s['topics'] and s['canonical_url'] not in used][:self.per_section]
+            if not items:
+                continue
+            parts.append(render_section_header(chrome["sections"][topic], first=not parts))
+            for item in items:
+                used.add(item['canonical_url'])
+                parts.append(fragments[item['canonical_url']])
+        return render_page("".join(parts), title=chrome["page"]), len(used)
+
+    def run(self) -> str:
+        topics = self.topics()
+        print(f"--- [Planejador] {len(self.subscribers)} assinante(s), {len(topics)} tópico(s), {len(self.languages())} idioma(s) ---")
+
+        with metrics.span("stage.search"):
+            limit = self.per_section * self.crew.rank_overfetch if self.crew.rank_overfetch > 1 else None
+            results = self.crew.tools['browser'].search_many(topics, max_results=limit, page_size=limit)
+
+        metrics.incr("articles_found", sum(len(found) for found in results.values()))
+        if self.crew.rank_overfetch > 1:
+            # Cada tópico fica com os candidatos mais relevantes para o número de itens por seção
+            results = self.crew.ranker.top_k(results, self.per_section)
+
+        with metrics.span("stage.process"):
+            articles = self._collect(results)
+        print(f"📰 {len(articles)} artigo(s) distinto(s) para {len(topics)} tópico(s).")
+        if not articles:
+            return "❌ Nenhum artigo foi encontrado. Encerrando."
+
+        # Cada artigo distinto é raspado e resumido uma única vez, qualquer que seja o número de assinantes
+        with metrics.span("stage.summarize"):
+            summaries = self.crew._summarize_articles(articles)
+        if not summaries:
+            return "❌ Nenhum resumo pode ser gerado. Encerrando."
+
+        # Agrupa assinantes com a mesma combinação de tópicos e idioma: uma montagem e um envio por grupo
+        groups = {}
+        for subscriber in self.subscribers:
+            groups.setdefault((tuple(subscriber.topics), subscriber.language), []).append(subscriber.email)
+
+        with metrics.span("stage.translate"):
+            fragments = {}
+            for language in self.languages():
+                # Só os artigos dos tópicos de quem lê neste idioma
+                wanted = {t for s in self.subscribers if s.language == language for t in s.topics}
+                fragments[language] = self._render_fragments([s for s in summaries if wanted & set(s['topics'])], language)
+
+        delivered, total = 0, sum(len(emails) for emails in groups.values())
+        with metrics.span("stage.send"):
+            for (topics_key, language), emails in groups.items():
+                chrome = self._chrome(list(topics_key), language)
+                html_content, count = self._assemble(list(topics_key), summaries, fragments[language], chrome)
+                if not count:
+                    print(f"   ⚠️  Nenhum artigo para {', '.join(topics_key)} ({language}); {len(emails)} assinante(s) sem envio.")
+                    continue
+                print(f"📬 Edição [{language}] {', '.join(topics_key)}: {count} artigos para {len(emails)} assinante(s).")
+                delivered += len(self.crew._send(html_content, emails))
+
+        message = (f"{delivered}/{total} assinantes atendidos com {len(groups)} edição(ões) distintas; "
+                   f"{len(summaries)} artigos resumidos uma única vez.")
+        return f"✅ {message}" if delivered == total else f"⚠️  {message}"
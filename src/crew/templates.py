@@ -0,0 +1,34 @@
+# src/crew/templates.py
+"""Blocos HTML da newsletter (compatíveis com clientes de e-mail: tabelas e estilos inline)."""
+
+PAGE_TITLE = "Seu Resumo Semanal sobre Design e Tecnologia"
+
+ARTICLE_ROW = (
+    '<tr><td style="padding: 15px 0; border-bottom: 1px solid #eeeeee;"><a href="{url}" style="text-decoration: none;">'
+    '<h3 style="font-family: Arial, sans-serif; font-size: 24px; font-weight: bold; color: #363737; margin-bottom: 5px;">{title}</h3></a>'
+    '<p style="font-size: 16px; color: #555555; line-height: 1.5; margin-top: 5px;">{summary}</p></td></tr>'
+)
+
+SECTION_HEADER = (
+    '<tr><td style="padding: {padding};"><h2 style="color: #363737; border-bottom: 2px solid #363737; padding-bottom: 5px;">'
+    '{title}</h2></td></tr>'
+)
+
+PAGE = """
+        <html><head><style>body {{ font-family: Arial, sans-serif; }}</style></head><body>
+        <table width="100%" border="0" cellspacing="0" cellpadding="0"><tr><td align="center">
+        <table width="40%" border="0" cellspacing="0" cellpadding="20" style="max-width: 600px; min-width: 400px; border-collapse: collapse;">
+            <tr><td align="center" style="padding: 20px 0;"><h1 style="font-size: 28px; color: #363737;">{title}</h1></td></tr>
+            {body}
+        </table></td></tr></table></body></html>
+        """
+
+def render_article(article: dict) -> str:
+    return ARTICLE_ROW.format(url=article['url'], title=article['title'], summary=article['summary'])
+
+def render_section_header(title: str, first: bool = False) -> str:
+    # A primeira seção fica mais próxima do título da newsletter
+    return SECTION_HEADER.format(title=title, padding="10px 0" if first else "20px 0 10px 0")
+
+def render_page(body: str, title: str = PAGE_TITLE) -> str:
+    return PAGE.format(title=title, body=body)
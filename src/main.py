@@ -1,23 +1,89 @@
+import argparse
+import os
+
 from src.crew.news_crew import NewsCrew
+from src.tools.metrics import metrics, profiling
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Crew de Newsletter de Design e Tecnologia")
+    parser.add_argument("--report-json", default=os.getenv("NEWSLETTER_REPORT_JSON"),
+                        help="salva o relatório de tempos e contadores da execução em JSON")
+    parser.add_argument("--report-prom", default=os.getenv("NEWSLETTER_PROMETHEUS_FILE"),
+                        help="salva as métricas no formato textfile do Prometheus (node_exporter)")
+    parser.add_argument("--profile", action="store_true", default=None,
+                        help="ativa cProfile e tracemalloc durante a execução")
+    parser.add_argument("--run-id", help="identificador da execução (padrão: gerado automaticamente)")
+    parser.add_argument("--resume", nargs="?", const=True, default=False, metavar="RUN_ID",
+                        help="retoma a execução indicada (ou a última não enviada) aproveitando as etapas concluídas")
+    parser.add_argument("--incremental", action="store_true",
+                        default=os.getenv("NEWSLETTER_INCREMENTAL", "") in ("1", "true", "yes"),
+                        help="processa só artigos novos e junta com os resumos de outras execuções da mesma janela")
+    parser.add_argument("--recipients", default=os.getenv("NEWSLETTER_RECIPIENTS"),
+                        help="destinatários separados por vírgula (dispensa a pergunta interativa)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--daemon", action="store_true",
+                      help="modo contínuo: prepara artigos ao longo da semana (envia em NEWSLETTER_SEND_AT, se definido)")
+    mode.add_argument("--send-ready", action="store_true",
+                      help="envia a newsletter com os artigos já preparados pelo daemon")
+    mode.add_argument("--subscribers", default=os.getenv("NEWSLETTER_SUBSCRIBERS_FILE"), metavar="ARQUIVO",
+                      help="JSON de assinantes com tópicos e idioma próprios (um resumo por artigo distinto)")
+    return parser.parse_args()
+
+def parse_recipients(value: str) -> list:
+    return [email.strip() for email in (value or "").split(",") if email.strip()]
 
 def main():
+    args = parse_args()
+
     print("## Bem-vindo ao Crew de Newsletter de Design e Tecnologia ##")
     print("---------------------------------------------------------")
     
     # Este e-mail será o destinatário da newsletter.
     # No futuro, você obterá essa lista do Supabase.
-    recipient_email = input("Por favor, insira o e-mail do destinatário: ")
+    if args.subscribers:
+        from src.crew.planner import NewsletterPlanner, load_subscribers
+        metrics.reset()
+        with profiling(enabled=args.profile):
+            result = NewsletterPlanner(load_subscribers(args.subscribers)).run()
+        finish(args, result)
+        return
+
+    recipients = parse_recipients(args.recipients)
+    if not recipients and not args.daemon:
+        recipient_input = input("Por favor, insira o e-mail do destinatário (separe vários por vírgula): ")
+        recipients = parse_recipients(recipient_input)
 
-    if not recipient_email:
+    if not recipients and not args.daemon:
         print("Nenhum e-mail fornecido. Encerrando.")
         return
 
-    news_crew = NewsCrew(recipient_email)
-    result = news_crew.run()
+    metrics.reset()
+    with profiling(enabled=args.profile):
+        run_id = args.resume if isinstance(args.resume, str) else args.run_id
+        news_crew = NewsCrew(recipients, run_id=run_id, resume=bool(args.resume), incremental=args.incremental)
+        if args.daemon or args.send_ready:
+            from src.crew.daemon import NewsDaemon
+            daemon = NewsDaemon(news_crew)
+            if args.daemon:
+                daemon.run_forever()
+                result = "Daemon encerrado."
+            else:
+                result = daemon.send()
+        else:
+            result = news_crew.run()
+    finish(args, result)
+
+def finish(args, result):
+    if args.report_json:
+        metrics.write_json(args.report_json)
+        print(f"📈 Relatório da execução salvo em {args.report_json}")
+    if args.report_prom:
+        metrics.write_prometheus(args.report_prom)
+        print(f"📈 Métricas Prometheus salvas em {args.report_prom}")
     
     print("\n---------------------------------------------------------")
     print(f"Processo finalizado. Resultado: {result}")
     print("## Fim da execução ##")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,40 +1,267 @@
 # src/tools/browser_tools.py
+import hashlib
 import os
 import requests
 import json
-from typing import Type
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Type
+from requests.adapters import HTTPAdapter
 from pydantic import BaseModel, Field
 
+from src.tools.metrics import metrics
+from src.tools.storage import cache_path, connect
+
 class NewsSearchInput(BaseModel):
     """Input schema for NewsSearchTool."""
     query: str = Field(..., description="Search query for news articles")
 
+class QuotaExceeded(Exception):
+    """A cota mensal da NewsAPI não permite mais requisições."""
+
+class SearchCache:
+    """Cache em disco das respostas da NewsAPI, por (query, data inicial, parâmetros)."""
+
+    def __init__(self, path: str = None, ttl: float = None):
+        self.path = path or os.getenv("NEWSAPI_CACHE_PATH") or cache_path("newsapi_cache.sqlite3")
+        self.ttl = ttl if ttl is not None else float(os.getenv("NEWSAPI_CACHE_TTL", "21600"))
+        self._lock = threading.Lock()
+        self._conn = None
+        self.stats = {"hits": 0, "misses": 0, "stale_hits": 0}
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect(self.path)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    body TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(params: dict) -> str:
+        # A chave da API não faz parte da identidade da consulta
+        public = {k: v for k, v in params.items() if k != "apiKey"}
+        return hashlib.sha256(json.dumps(public, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str, allow_stale: bool = False, max_age: float = None) -> Optional[dict]:
+        """Resposta em cache; `max_age` encurta a validade para esta consulta (ex.: buscas periódicas)."""
+        ttl = self.ttl if max_age is None else min(self.ttl, max_age)
+        with self._lock:
+            row = self._db().execute("SELECT body, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            if time.time() - row[1] > ttl:
+                if not allow_stale:
+                    self.stats["misses"] += 1
+                    return None
+                self.stats["stale_hits"] += 1
+            else:
+                self.stats["hits"] += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, body: dict):
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, body, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(body), time.time()),
+            )
+            # Respostas antigas só servem como fallback; descartamos após 30 dias
+            db.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - 30 * 86400,))
+            db.commit()
+
+class QuotaBudget:
+    """Contador persistente de requisições mensais à NewsAPI (compartilhado entre processos).
+
+    Quando restam `reserve` requisições, apenas buscas essenciais (primeira página) são feitas;
+    com a cota esgotada, nenhuma requisição é feita.
+    """
+
+    def __init__(self, path: str = None, monthly_limit: int = None, reserve: int = None):
+        self.path = path or os.getenv("NEWSAPI_QUOTA_PATH") or cache_path("newsapi_quota.sqlite3")
+        self.monthly_limit = monthly_limit if monthly_limit is not None else int(os.getenv("NEWSAPI_MONTHLY_QUOTA", "1000"))
+        self.reserve = reserve if reserve is not None else int(os.getenv("NEWSAPI_QUOTA_RESERVE", "50"))
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect(self.path)
+            self._conn.isolation_level = None  # transações explícitas
+            self._conn.execute("CREATE TABLE IF NOT EXISTS usage (month TEXT PRIMARY KEY, requests INTEGER NOT NULL)")
+        return self._conn
+
+    @staticmethod
+    def _month() -> str:
+        return datetime.now().strftime("%Y-%m")
+
+    def used(self) -> int:
+        with self._lock:
+            row = self._db().execute("SELECT requests FROM usage WHERE month = ?", (self._month(),)).fetchone()
+            return row[0] if row else 0
+
+    def try_acquire(self, essential: bool = True) -> bool:
+        """Reserva uma requisição da cota do mês; retorna False se não houver orçamento."""
+        limit = self.monthly_limit if essential else self.monthly_limit - self.reserve
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute("SELECT requests FROM usage WHERE month = ?", (self._month(),)).fetchone()
+                used = row[0] if row else 0
+                if used >= limit:
+                    db.execute("ROLLBACK")
+                    return False
+                db.execute(
+                    "INSERT INTO usage (month, requests) VALUES (?, 1) "
+                    "ON CONFLICT(month) DO UPDATE SET requests = requests + 1",
+                    (self._month(),),
+                )
+                db.execute("COMMIT")
+                return True
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+
 class NewsSearchTool:
     name: str = "news_search_tool"
     description: str = "Busca as notícias mais recentes e relevantes sobre um tópico em inglês."
     args_schema: Type[BaseModel] = NewsSearchInput
 
-    def _run(self, query: str) -> str:
-        """Execute the tool."""
-        api_key = os.getenv("NEWSAPI_KEY")
-        # Buscando 3 artigos por query (ordenado por data para ter artigos mais recentes)
-        from datetime import datetime, timedelta
-        yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-        url = f"https://newsapi.org/v2/everything?q={query}&language=en&sortBy=publishedAt&from={yesterday}&pageSize=3&apiKey={api_key}"
-        
+    # A NewsAPI aceita até 100 artigos por página
+    max_page_size: int = 100
+
+    def __init__(self, cache: SearchCache = None, quota: QuotaBudget = None):
+        self.base_url = os.getenv("NEWSAPI_BASE_URL", "https://newsapi.org/v2")
+        # Buscando 3 artigos por query por padrão (ordenado por data para ter artigos mais recentes)
+        self.page_size = int(os.getenv("NEWSAPI_PAGE_SIZE", "3"))
+        self.max_workers = int(os.getenv("NEWSAPI_MAX_WORKERS", "4"))
+        self.cache = cache or SearchCache()
+        self.quota = quota or QuotaBudget()
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def _get_session(self) -> requests.Session:
+        # Sessão compartilhada: reaproveita conexões TLS entre tópicos e páginas
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, self.max_workers))
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def _params(self, query: str, page_size: int, page: int, from_date: str = None) -> dict:
+        if from_date is None:
+            from_date = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+        return {
+            "q": query,
+            "language": "en",
+            "sortBy": "publishedAt",
+            "from": from_date,
+            "pageSize": min(page_size, self.max_page_size),
+            "page": page,
+        }
+
+    def _fetch_page(self, params: dict, essential: bool, max_age: float = None) -> dict:
+        key = self.cache.make_key(params)
+        cached = self.cache.get(key, max_age=max_age)
+        if cached is not None:
+            metrics.incr("cache_hits", cache="newsapi")
+            return cached
+        metrics.incr("cache_misses", cache="newsapi")
+
+        if not self.quota.try_acquire(essential=essential):
+            # Sem orçamento: usa uma resposta antiga, se existir, em vez de gastar a cota
+            stale = self.cache.get(key, allow_stale=True)
+            if stale is not None:
+                print(f"⚠️  Cota da NewsAPI no limite: usando resultado em cache para '{params['q']}'.")
+                return stale
+            raise QuotaExceeded(f"Cota mensal da NewsAPI esgotada ou reservada ({self.quota.used()}/{self.quota.monthly_limit} requisições).")
+
         try:
-            response = requests.get(url)
+            with metrics.span("search.request", query=params["q"], page=params["page"]):
+                response = self._get_session().get(
+                    f"{self.base_url}/everything",
+                    params={**params, "apiKey": os.getenv("NEWSAPI_KEY")},
+                    timeout=15,
+                )
+            metrics.incr("bytes_downloaded", len(response.content))
             response.raise_for_status()
-            articles = response.json().get("articles", [])
-            
-            if not articles:
-                return "[]" # Retorna uma lista JSON vazia
-            
-            # Retorna uma string JSON com os dados estruturados
-            return json.dumps([{"title": a["title"], "url": a["url"]} for a in articles])
+            body = response.json()
+        except Exception:
+            stale = self.cache.get(key, allow_stale=True)
+            if stale is None:
+                raise
+            print(f"⚠️  NewsAPI indisponível: usando resultado em cache para '{params['q']}'.")
+            return stale
+        self.cache.put(key, body)
+        return body
+
+    def iter_articles(self, query: str, max_results: int = None, page_size: int = None, from_date: str = None,
+                      max_age: float = None) -> Iterator[dict]:
+        """Percorre os resultados página por página, parando assim que `max_results` artigos forem obtidos.
+
+        `max_age` (segundos) limita a idade das respostas aceitas do cache.
+        """
+        page_size = page_size or self.page_size
+        max_results = max_results or page_size
+        # Páginas maiores que o limite da API são paginadas
+        page_size = min(page_size, self.max_page_size)
+        page, yielded = 1, 0
+        while yielded < max_results:
+            try:
+                body = self._fetch_page(self._params(query, page_size, page, from_date), essential=(page == 1), max_age=max_age)
+            except QuotaExceeded:
+                if page == 1:
+                    raise
+                # Perto do limite mensal: entrega só as páginas já obtidas
+                print(f"⚠️  Reserva da cota da NewsAPI atingida: paginação de '{query}' interrompida.")
+                return
+            articles = body.get("articles", [])
+            for a in articles:
+                yield {"title": a["title"], "url": a["url"], "description": a.get("description") or ""}
+                yielded += 1
+                if yielded >= max_results:
+                    return
+            if not articles or page * page_size >= body.get("totalResults", 0):
+                return
+            page += 1
+
+    def search(self, query: str, max_results: int = None, page_size: int = None, max_age: float = None) -> List[dict]:
+        """Busca artigos sobre um tópico; retorna lista vazia em caso de erro."""
+        articles = []
+        try:
+            for article in self.iter_articles(query, max_results=max_results, page_size=page_size, max_age=max_age):
+                articles.append(article)
+        except QuotaExceeded as e:
+            print(f"⚠️  {e}")
         except Exception as e:
             print(f"Erro na ferramenta de busca: {e}")
-            return "[]" # Retorna uma lista JSON vazia em caso de erro
+        return articles
+
+    def search_many(self, queries: List[str], max_results: int = None, page_size: int = None,
+                    max_age: float = None) -> Dict[str, List[dict]]:
+        """Busca todos os tópicos em paralelo (um único tempo de ida e volta para vários tópicos)."""
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(queries)))) as executor:
+            results = executor.map(
+                lambda q: self.search(q, max_results=max_results, page_size=page_size, max_age=max_age), queries,
+            )
+            return dict(zip(queries, results))
+
+    def _run(self, query: str) -> str:
+        """Execute the tool."""
+        # Retorna uma string JSON com os dados estruturados (lista vazia em caso de erro)
+        return json.dumps(self.search(query))
 
 # Instância da ferramenta
-news_search_tool = NewsSearchTool()
\ No newline at end of file
+news_search_tool = NewsSearchTool()
@@ -0,0 +1,144 @@
+# src/tools/compressor.py
+import os
+import re
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from src.tools.summarizer import count_tokens
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[\"'“‘(\[]?[A-Z0-9])")
+_WORD = re.compile(r"[a-z][a-z'\-]{2,}")
+
+# Chamadas de navegação e de ação que abrem a linha ("Subscribe to...", "Read more", "Sign in")
+_BOILERPLATE_LEAD = re.compile(
+    r"^\W*(?:subscribe|sign (?:up|in)|log ?in|read more|click here|follow us|share this|advertisement|"
+    r"sponsored|related articles?|recommended for you)\b",
+    re.IGNORECASE | re.MULTILINE,
+)
+# Legendas, créditos e rodapés: só contam em fragmentos curtos
+_BOILERPLATE = re.compile(
+    r"\b(?:(?:all rights reserved|getty images|terms of (?:use|service))\b|(?:photo(?:graph)?|image|credit)s?\s*:)",
+    re.IGNORECASE,
+)
+
+_STOPWORDS = frozenset("""
+the and for that with this from are was were has have had not but its it's you your they their them his her our
+will would can could should may might been being into about after before over than then there here when where which
+who whom what why how all any each some more most other such only also just very said says say one two new like
+""".split())
+
+@dataclass
+class CompressionStats:
+    """Resultado da compressão de um texto."""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    sentences: int = 0
+    kept: int = 0
+    boilerplate: int = 0
+
+    @property
+    def ratio(self) -> float:
+        """Fração dos tokens de entrada que segue para o LLM."""
+        return self.output_tokens / self.input_tokens if self.input_tokens else 1.0
+
+class ExtractiveCompressor:
+    """Reduz o texto raspado antes do LLM, mantendo as sentenças mais centrais do artigo.
+
+    Remove boilerplate (navegação, legendas, chamadas e trechos repetidos), pontua as sentenças
+    por TextRank sobre vetores TF-IDF (tudo vetorizado em NumPy, com um leve bônus para o lide) e
+    mantém as melhores, na ordem original, até o orçamento de tokens.
+    """
+
+    version = 2
+
+    def __init__(self, token_budget: int = None, max_sentences: int = 600, damping: float = 0.85, iterations: int = 50):
+        # 0 desliga a seleção de sentenças (só a limpeza de boilerplate é aplicada)
+        self.token_budget = token_budget if token_budget is not None else int(os.getenv("COMPRESSOR_TOKEN_BUDGET", "1500"))
+        # A matriz de similaridade é quadrática: páginas enormes só concorrem com as primeiras sentenças
+        self.max_sentences = max_sentences
+        self.damping = damping
+        self.iterations = iterations
+
+    def params(self) -> dict:
+        """Parâmetros que alteram o texto comprimido (fazem parte da chave do cache de resumos)."""
+        return {"compressor": self.version, "token_budget": self.token_budget, "max_sentences": self.max_sentences}
+
+    @staticmethod
+    def _is_boilerplate(sentence: str) -> bool:
+        words = sentence.split()
+        # Fragmentos curtos (títulos, legendas, botões), chamadas no início da linha e créditos em trechos curtos
+        if len(words) < 5:
+            return True
+        if len(words) < 25 and _BOILERPLATE_LEAD.search(sentence):
+            return True
+        return len(words) < 12 and bool(_BOILERPLATE.search(sentence))
+
+    def _clean(self, text: str) -> tuple:
+        sentences = [s.strip() for s in _SENTENCE_BOUNDARY.split(text) if s.strip()]
+        kept, seen = [], set()
+        for sentence in sentences:
+            normalized = " ".join(sentence.lower().split())
+            if normalized in seen or self._is_boilerplate(sentence):
+                continue
+            seen.add(normalized)
+            kept.append(sentence)
+        return sentences, kept
+
+    def _scores(self, sentences: List[str]) -> np.ndarray:
+        """TextRank sobre a similaridade de cosseno entre os vetores TF-IDF das sentenças."""
+        tokens = [[w for w in _WORD.findall(s.lower()) if w not in _STOPWORDS] for s in sentences]
+        vocabulary = {w: i for i, w in enumerate(sorted({w for ws in tokens for w in ws}))}
+        if not vocabulary:
+            return np.ones(len(sentences))
+
+        rows = np.repeat(np.arange(len(tokens)), [len(ws) for ws in tokens])
+        cols = np.fromiter((vocabulary[w] for ws in tokens for w in ws), dtype=np.int64, count=len(rows))
+        tf = np.zeros((len(sentences), len(vocabulary)), dtype=np.float32)
+        np.add.at(tf, (rows, cols), 1.0)
+        tf = np.log1p(tf)
+        df = np.count_nonzero(tf, axis=0)
+        tfidf = tf * (np.log((1 + len(sentences)) / (1 + df)) + 1)
+        norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+        tfidf /= np.where(norms == 0, 1, norms)
+
+        similarity = tfidf @ tfidf.T
+        np.fill_diagonal(similarity, 0)
+        # Sentenças sem vizinhos distribuem seu peso igualmente (nó "pendente" do PageRank)
+        out_weight = similarity.sum(axis=1, keepdims=True)
+        transition = np.where(out_weight > 0, similarity / np.where(out_weight == 0, 1, out_weight), 1 / len(sentences))
+        rank = np.full(len(sentences), 1 / len(sentences))
+        for _ in range(self.iterations):
+            updated = (1 - self.damping) / len(sentences) + self.damping * (transition.T @ rank)
+            if np.abs(updated - rank).sum() < 1e-6:
+                rank = updated
+                break
+            rank = updated
+        # Notícias concentram o essencial no início
+        lead = 1 + 0.5 * np.exp(-np.arange(len(sentences)) / 5)
+        return rank * lead
+
+    def compress(self, text: str) -> tuple:
+        """Retorna (texto comprimido, estatísticas)."""
+        stats = CompressionStats(input_tokens=count_tokens(text))
+        sentences, kept = self._clean(text)
+        stats.sentences, stats.boilerplate = len(sentences), len(sentences) - len(kept)
+        if not kept:
+            # Nada reconhecível como prosa: o texto segue como veio
+            stats.output_tokens, stats.kept, stats.boilerplate = stats.input_tokens, len(sentences), 0
+            return text, stats
+
+        sizes = np.array([count_tokens(" " + s) for s in kept])
+        if self.token_budget and sizes.sum() > self.token_budget:
+            kept, sizes = kept[:self.max_sentences], sizes[:self.max_sentences]
+            chosen, total = [], 0
+            for index in np.argsort(-self._scores(kept), kind="stable"):
+                if total + sizes[index] <= self.token_budget:
+                    chosen.append(index)
+                    total += sizes[index]
+            kept = [kept[i] for i in sorted(chosen)] or kept[:1]
+
+        compressed = " ".join(kept)
+        stats.kept, stats.output_tokens = len(kept), count_tokens(compressed)
+        return compressed, stats
@@ -1,46 +1,202 @@
 # src/tools/email_tools.py
 import os
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
-from typing import Type
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Type
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
 from pydantic import BaseModel, Field
 
+from src.tools.metrics import metrics
+
 class EmailInput(BaseModel):
     """Input schema for EmailTool."""
     recipient_email: str = Field(..., description="Email address of the recipient")
     content: str = Field(..., description="HTML content of the email")
 
+@dataclass
+class BatchResult:
+    """Resultado do envio de um lote de destinatários."""
+    index: int
+    recipients: List[str]
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    # A última falha aconteceu antes de a requisição chegar ao SendGrid (conexão recusada, DNS, timeout de conexão)
+    not_sent: bool = False
+    # Espera pedida pelo SendGrid no último 429 (Retry-After ou X-RateLimit-Reset), em segundos
+    retry_after: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code is not None and 200 <= self.status_code < 300
+
+    @property
+    def retryable(self) -> bool:
+        # mail/send não é idempotente: após um timeout de leitura ou 5xx o e-mail pode ter saído,
+        # então só são reenviados o rate limit e as falhas em que a requisição nem foi enviada
+        return self.status_code == 429 or (self.status_code is None and self.not_sent)
+
+class _RateLimiter:
+    """Espaça as requisições para não ultrapassar `rate` requisições por segundo."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
 class EmailTool:
     name: str = "email_tool"
     description: str = "Envia um e-mail com a newsletter finalizada para um destinatário usando o SendGrid."
     args_schema: Type[BaseModel] = EmailInput
 
-    def _run(self, recipient_email: str, content: str) -> str:
-        """Execute the tool."""
+    subject: str = "O seu resumo semanal sobre Design e Tecnologia" # Título do e-mail atualizado
+    # O SendGrid aceita até 1000 personalizations por requisição
+    max_personalizations: int = 1000
+
+    def __init__(self):
+        self.api_url = os.getenv("SENDGRID_API_URL", "https://api.sendgrid.com/v3/mail/send")
+        self.max_workers = int(os.getenv("SENDGRID_MAX_WORKERS", "4"))
+        self.max_retries = int(os.getenv("SENDGRID_MAX_RETRIES", "3"))
+        # Esperas maiores que isso (limite diário, por exemplo) não valem a pena: o lote volta como falha
+        self.max_retry_wait = float(os.getenv("SENDGRID_MAX_RETRY_WAIT", "60"))
+        self.batch_size = min(int(os.getenv("SENDGRID_BATCH_SIZE", str(self.max_personalizations))), self.max_personalizations)
+        self.rate_limiter = _RateLimiter(float(os.getenv("SENDGRID_MAX_REQUESTS_PER_SECOND", "10")))
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def _get_session(self) -> requests.Session:
+        # Um único cliente HTTP com pool de conexões, reaproveitado entre envios
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, self.max_workers))
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def _build_payload(self, sender_email: str, recipients: List[str], content: str, subject: str) -> dict:
+        # Uma personalization por destinatário: ninguém vê o endereço dos demais
+        return {
+            "personalizations": [{"to": [{"email": recipient}]} for recipient in recipients],
+            "from": {"email": sender_email},
+            "subject": subject,
+            "content": [{"type": "text/html", "value": content}],
+        }
+
+    def _send_batch(self, api_key: str, payload: dict, result: BatchResult) -> BatchResult:
+        self.rate_limiter.wait()
+        result.attempts += 1
+        if result.attempts > 1:
+            metrics.incr("retries", kind="email_batch")
+        try:
+            with metrics.span("email.batch", recipients=len(result.recipients)):
+                response = self._get_session().post(
+                    self.api_url,
+                    json=payload,
+                    headers={"Authorization": f"Bearer {api_key}"},
+                    timeout=30,
+                )
+            result.status_code = response.status_code
+            result.error = None if result.ok else response.text
+            result.not_sent = False
+            result.retry_after = self._retry_after(response) if response.status_code == 429 else 0.0
+        except Exception as e:
+            result.status_code = None
+            result.error = str(e)
+            result.not_sent = self._not_sent(e)
+        return result
+
+    @staticmethod
+    def _retry_after(response) -> float:
+        """Segundos até o SendGrid aceitar novas requisições: Retry-After ou X-RateLimit-Reset (instante Unix)."""
+        headers = getattr(response, "headers", None) or {}
+        try:
+            if headers.get("Retry-After"):
+                return max(0.0, float(headers["Retry-After"]))
+            if headers.get("X-RateLimit-Reset"):
+                return max(0.0, float(headers["X-RateLimit-Reset"]) - time.time())
+        except ValueError:
+            pass
+        return 0.0
+
+    @staticmethod
+    def _not_sent(error: Exception) -> bool:
+        """Indica se a exceção ocorreu antes de o corpo da requisição ser enviado."""
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+            # Conexão abortada no meio da resposta também vira ConnectionError: só a falha ao conectar é segura
+            return isinstance(getattr(error.args[0], "reason", None), NewConnectionError)
+        return False
+
+    def send_bulk(self, recipients: List[str], content: str, subject: str = None) -> List[BatchResult]:
+        """Envia o mesmo HTML para vários destinatários, em lotes de personalizations enviados em paralelo."""
         sender_email = os.getenv("SENDER_EMAIL")
         api_key = os.getenv("SENDGRID_API_KEY")
 
         if not all([sender_email, api_key]):
-            return "Erro: Variáveis de ambiente SENDER_EMAIL e SENDGRID_API_KEY devem estar configuradas."
+            raise ValueError("Variáveis de ambiente SENDER_EMAIL e SENDGRID_API_KEY devem estar configuradas.")
+
+        # Remove endereços vazios e duplicados, mantendo a ordem
+        unique, seen = [], set()
+        for recipient in recipients:
+            address = recipient.strip()
+            if address and address.lower() not in seen:
+                seen.add(address.lower())
+                unique.append(address)
+
+        subject = subject or self.subject
+        batches = [unique[i:i + self.batch_size] for i in range(0, len(unique), self.batch_size)]
+        payloads = [self._build_payload(sender_email, batch, content, subject) for batch in batches]
+        results = [BatchResult(index=i, recipients=batch) for i, batch in enumerate(batches)]
 
-        # A mudança crítica está aqui: o conteúdo agora é tratado como 'html_content'
-        message = Mail(
-            from_email=sender_email,
-            to_emails=recipient_email,
-            subject="O seu resumo semanal sobre Design e Tecnologia", # Título do e-mail atualizado
-            html_content=content # Usando html_content em vez de plain_text
-        )
+        pending = list(results)
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    # Backoff exponencial com jitter, nunca menor que a espera pedida pelo SendGrid;
+                    # apenas os lotes que falharam são reenviados
+                    backoff = min(30, 2 ** (attempt - 1)) * (0.5 + random.random())
+                    time.sleep(max([backoff] + [r.retry_after for r in pending]))
+                    print(f"🔁 Reenviando {len(pending)} lote(s) (tentativa {attempt + 1})...")
+                list(executor.map(lambda r: self._send_batch(api_key, payloads[r.index], r), pending))
+                pending = [r for r in pending if not r.ok and r.retryable and r.retry_after <= self.max_retry_wait]
+                if not pending:
+                    break
+        return results
 
+    def _run(self, recipient_email: str, content: str) -> str:
+        """Execute the tool."""
         try:
-            sg = SendGridAPIClient(api_key)
-            response = sg.send(message)
-            
-            if response.status_code >= 200 and response.status_code < 300:
-                return f"Newsletter enviada com sucesso para {recipient_email}."
-            else:
-                return f"Falha ao enviar e-mail via SendGrid. Status: {response.status_code}. Detalhes: {response.body}"
+            result = self.send_bulk([recipient_email], content)[0]
+        except ValueError as e:
+            return f"Erro: {e}"
         except Exception as e:
             return f"Uma exceção ocorreu ao enviar o e-mail via SendGrid: {e}"
 
+        if result.ok:
+            return f"Newsletter enviada com sucesso para {recipient_email}."
+        elif result.status_code is None:
+            return f"Uma exceção ocorreu ao enviar o e-mail via SendGrid: {result.error}"
+        else:
+            return f"Falha ao enviar e-mail via SendGrid. Status: {result.status_code}. Detalhes: {result.error}"
+
 # Instância da ferramenta
-email_tool = EmailTool()
\ No newline at end of file
+email_tool = EmailTool()
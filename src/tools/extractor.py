@@ -0,0 +1,314 @@
+# src/tools/extractor.py
+import importlib.util
+import os
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+
+# Tentar extrair conteúdo de diferentes tags (em ordem de prioridade)
+CONTENT_SELECTORS = [
+    'article',
+    '.article-content',
+    '.content',
+    '.post-content',
+    '.story-body',
+    'main',
+    '[role="main"]'
+]
+
+TEXT_TAGS = ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+FALLBACK_TAGS = ['p', 'h1', 'h2', 'h3']
+
+def default_parser() -> str:
+    """Usa o lxml quando instalado (bem mais rápido) e o html.parser caso contrário."""
+    parser = os.getenv("EXTRACTOR_PARSER")
+    if parser:
+        return parser
+    # find_spec verifica a instalação sem pagar o import agora
+    return "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+def _soup(content, parser: str):
+    # bs4 é importado só na primeira extração
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(content, parser)
+
+def _join_text(elements) -> str:
+    texts = (elem.get_text().strip() for elem in elements)
+    return ' '.join(text for text in texts if text)
+
+class ArticleExtractor(ABC):
+    """Interface dos extratores: recebe o HTML e retorna o texto principal do artigo."""
+    name: str = "base"
+
+    def __init__(self, parser: str = None):
+        self.parser = parser or default_parser()
+
+    @abstractmethod
+    def extract(self, content) -> str:
+        """Texto principal do artigo contido no HTML (bytes ou str)."""
+
+    def probe(self, enough_chars: int):
+        """Acompanha o download da página (ver `ArticleProbe`); o resultado vai para `extract_probe`."""
+        return ArticleProbe(enough_chars)
+
+    def extract_probe(self, probe, content: bytes) -> str:
+        # Por padrão, a página baixada é analisada de novo pelo extrator
+        return self.extract(content)
+
+class LegacyExtractor(ArticleExtractor):
+    """Implementação original: uma passada de `soup.select` por seletor."""
+    name = "legacy"
+
+    def extract(self, content) -> str:
+        soup = _soup(content, self.parser)
+
+        # Remover scripts e estilos
+        for script in soup(["script", "style"]):
+            script.decompose()
+
+        full_text = ""
+
+        # Tentar seletores específicos primeiro
+        for selector in CONTENT_SELECTORS:
+            elements = soup.select(selector)
+            if elements:
+                text_elements = elements[0].find_all(TEXT_TAGS)
+                if text_elements:
+                    full_text = ' '.join([elem.get_text().strip() for elem in text_elements if elem.get_text().strip()])
+                    break
+
+        # Se não encontrou conteúdo específico, usar método geral
+        if not full_text.strip():
+            text_elements = soup.find_all(FALLBACK_TAGS)
+            full_text = ' '.join([elem.get_text().strip() for elem in text_elements if elem.get_text().strip()])
+
+        return full_text
+
+class FastExtractor(ArticleExtractor):
+    """Percorre a árvore uma única vez para achar os contêineres candidatos e o texto de fallback.
+
+    Produz o mesmo texto que o `LegacyExtractor` para as regras de `CONTENT_SELECTORS`.
+    """
+    name = "fast"
+
+    @staticmethod
+    def _matches(name: str, classes, role) -> list:
+        # Índices dos seletores de CONTENT_SELECTORS que casam com a tag
+        matched = []
+        if name == 'article':
+            matched.append(0)
+        if classes:
+            if 'article-content' in classes:
+                matched.append(1)
+            if 'content' in classes:
+                matched.append(2)
+            if 'post-content' in classes:
+                matched.append(3)
+            if 'story-body' in classes:
+                matched.append(4)
+        if name == 'main':
+            matched.append(5)
+        if role == 'main':
+            matched.append(6)
+        return matched
+
+    def extract(self, content) -> str:
+        soup = _soup(content, self.parser)
+
+        candidates = [None] * len(CONTENT_SELECTORS)
+        fallback = []
+        removable = []
+        fallback_tags = set(FALLBACK_TAGS)
+
+        for tag in soup.find_all(True):
+            if tag.name in ('script', 'style'):
+                removable.append(tag)
+                continue
+            for index in self._matches(tag.name, tag.get('class'), tag.get('role')):
+                # Mantém apenas o primeiro elemento na ordem do documento (como `select(...)[0]`)
+                if candidates[index] is None:
+                    candidates[index] = tag
+            if tag.name in fallback_tags:
+                fallback.append(tag)
+
+        # Remover scripts e estilos
+        for tag in removable:
+            tag.decompose()
+
+        full_text = ""
+        for candidate in candidates:
+            if candidate is None:
+                continue
+            text_elements = candidate.find_all(TEXT_TAGS)
+            if text_elements:
+                full_text = _join_text(text_elements)
+                break
+
+        if not full_text.strip():
+            full_text = _join_text(fallback)
+
+        return full_text
+
+    def probe(self, enough_chars: int):
+        # Com lxml, a árvore montada durante o download é a mesma usada na extração
+        if self.parser == "lxml":
+            return StreamingProbe(enough_chars)
+        return super().probe(enough_chars)
+
+    def extract_probe(self, probe, content: bytes) -> str:
+        if isinstance(probe, StreamingProbe):
+            return self.extract_tree(probe.close())
+        return super().extract_probe(probe, content)
+
+    def extract_tree(self, root) -> str:
+        """Mesmas regras de `extract`, sobre uma árvore do lxml já montada."""
+        if root is None:
+            return ""
+        from lxml import etree
+        # Como `decompose` no BeautifulSoup: o texto após a tag removida continua no documento
+        etree.strip_elements(root, "script", "style", etree.Comment, etree.ProcessingInstruction, with_tail=False)
+
+        candidates = [None] * len(CONTENT_SELECTORS)
+        fallback = []
+        fallback_tags = set(FALLBACK_TAGS)
+        text_tags = set(TEXT_TAGS)
+
+        for element in root.iter(etree.Element):
+            classes = element.get('class')
+            for index in self._matches(element.tag, classes.split() if classes else None, element.get('role')):
+                if candidates[index] is None:
+                    candidates[index] = element
+            if element.tag in fallback_tags:
+                fallback.append(element)
+
+        full_text = ""
+        for candidate in candidates:
+            if candidate is None:
+                continue
+            text_elements = [e for e in candidate.iter(etree.Element) if e is not candidate and e.tag in text_tags]
+            if text_elements:
+                full_text = _join_tree_text(text_elements)
+                break
+
+        if not full_text.strip():
+            full_text = _join_tree_text(fallback)
+
+        return full_text
+
+def _join_tree_text(elements) -> str:
+    texts = ("".join(elem.itertext()).strip() for elem in elements)
+    return ' '.join(text for text in texts if text)
+
+class ArticleProbe(HTMLParser):
+    """Acompanha o HTML à medida que chega e indica quando o resto da página já não é necessário.
+
+    Conta o texto visível das tags de `TEXT_TAGS` e considera a leitura concluída quando há texto
+    suficiente ou quando o primeiro `<article>` com conteúdo fecha (é ele que os extratores usam).
+    """
+
+    def __init__(self, enough_chars: int, min_article_chars: int = 500):
+        super().__init__(convert_charrefs=True)
+        self.enough_chars = enough_chars
+        self.min_article_chars = min_article_chars
+        self.text_chars = 0
+        self.article_chars = 0
+        self.article_closed = False
+        self._skip = 0
+        self._text = 0
+        self._article = 0
+        self._text_tags = set(TEXT_TAGS)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style'):
+            self._skip += 1
+        elif tag in self._text_tags:
+            self._text += 1
+        elif tag == 'article' and not self.article_closed:
+            self._article += 1
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style'):
+            self._skip = max(0, self._skip - 1)
+        elif tag in self._text_tags:
+            self._text = max(0, self._text - 1)
+        elif tag == 'article' and self._article:
+            self._article -= 1
+            if not self._article:
+                self.article_closed = True
+
+    def handle_data(self, data):
+        if self._text and not self._skip:
+            size = len(data.strip())
+            self.text_chars += size
+            if self._article:
+                self.article_chars += size
+
+    @property
+    def done(self) -> bool:
+        return self.text_chars >= self.enough_chars or (self.article_closed and self.article_chars >= self.min_article_chars)
+
+class StreamingProbe:
+    """`ArticleProbe` sobre o `HTMLPullParser` do lxml: a árvore montada durante o download é entregue
+    ao extrator (`FastExtractor.extract_tree`), e a página é analisada uma única vez.
+    """
+
+    def __init__(self, enough_chars: int, min_article_chars: int = 500):
+        from lxml import etree
+        self._parser = etree.HTMLPullParser(events=("start", "end"))
+        self.enough_chars = enough_chars
+        self.min_article_chars = min_article_chars
+        self.text_chars = 0
+        self.article_chars = 0
+        self.article_closed = False
+        self._fed = False
+        self._text = 0
+        self._article = 0
+        self._text_tags = set(TEXT_TAGS)
+
+    def feed(self, data: str):
+        if not data:
+            return
+        self._fed = True
+        self._parser.feed(data)
+        for event, element in self._parser.read_events():
+            tag = element.tag
+            if event == "start":
+                if tag in self._text_tags:
+                    self._text += 1
+                elif tag == 'article' and not self.article_closed:
+                    self._article += 1
+            elif tag in self._text_tags and self._text:
+                self._text -= 1
+                if not self._text:
+                    # Fim da tag de texto mais externa: o conteúdo dela já está completo
+                    size = sum(len(piece.strip()) for piece in element.itertext())
+                    self.text_chars += size
+                    if self._article:
+                        self.article_chars += size
+            elif tag == 'article' and self._article:
+                self._article -= 1
+                if not self._article:
+                    self.article_closed = True
+
+    @property
+    def done(self) -> bool:
+        return self.text_chars >= self.enough_chars or (self.article_closed and self.article_chars >= self.min_article_chars)
+
+    def close(self):
+        """Raiz da árvore (None se nada foi lido); o HTML truncado é fechado pelo próprio lxml."""
+        if not self._fed:
+            return None
+        try:
+            return self._parser.close()
+        except Exception:
+            return None
+
+EXTRACTORS = {
+    LegacyExtractor.name: LegacyExtractor,
+    FastExtractor.name: FastExtractor,
+}
+
+def get_extractor(name: str = None, parser: str = None) -> ArticleExtractor:
+    name = name or os.getenv("ARTICLE_EXTRACTOR", "fast")
+    if name not in EXTRACTORS:
+        raise ValueError(f"Extrator desconhecido: {name}")
+    return EXTRACTORS[name](parser=parser)
@@ -0,0 +1,125 @@
+# src/tools/fetch_cache.py
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from src.tools.storage import cache_path, connect
+from src.tools.url_utils import canonicalize_url
+
+@dataclass
+class FetchCacheEntry:
+    url: str
+    text: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+class FetchCache:
+    """Cache em disco do texto extraído das páginas, com revalidação condicional (ETag/Last-Modified)."""
+
+    def __init__(self, path: str = None, ttl: float = None, max_bytes: int = None):
+        self.path = path or os.getenv("FETCH_CACHE_PATH") or cache_path("fetch_cache.sqlite3")
+        self.ttl = ttl if ttl is not None else float(os.getenv("FETCH_CACHE_TTL", "86400"))
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("FETCH_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+        self._lock = threading.Lock()
+        self._conn = None
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "evictions": 0}
+
+    def _db(self):
+        # Conexão aberta sob demanda para não criar arquivos ao importar o módulo
+        if self._conn is None:
+            self._conn = connect(self.path)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access)")
+            self._conn.commit()
+        return self._conn
+
+    def record(self, counter: str):
+        with self._lock:
+            self.stats[counter] = self.stats.get(counter, 0) + 1
+
+    def get(self, url: str) -> Optional[FetchCacheEntry]:
+        """Busca uma entrada pela URL canônica (atualiza o acesso para o LRU)."""
+        key = canonicalize_url(url)
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT url, text, etag, last_modified, fetched_at FROM pages WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            entry = FetchCacheEntry(*row)
+            # Entradas expiradas sem validadores não podem ser revalidadas
+            if not self.is_fresh(entry) and not (entry.etag or entry.last_modified):
+                db.execute("DELETE FROM pages WHERE url = ?", (key,))
+                db.commit()
+                return None
+            db.execute("UPDATE pages SET last_access = ? WHERE url = ?", (time.time(), key))
+            db.commit()
+            return entry
+
+    def is_fresh(self, entry: FetchCacheEntry) -> bool:
+        return time.time() - entry.fetched_at < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: FetchCacheEntry) -> dict:
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def touch(self, url: str):
+        """Renova a validade de uma entrada após uma resposta 304."""
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("UPDATE pages SET fetched_at = ?, last_access = ? WHERE url = ?", (now, now, canonicalize_url(url)))
+            db.commit()
+
+    def put(self, url: str, text: str, etag: str = None, last_modified: str = None):
+        now = time.time()
+        size = len(text.encode("utf-8"))
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO pages (url, text, etag, last_modified, fetched_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (canonicalize_url(url), text, etag, last_modified, now, now, size),
+            )
+            self._evict(db)
+            db.commit()
+
+    def _evict(self, db):
+        # Remove as entradas menos usadas recentemente até caber no limite de tamanho
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in db.execute("SELECT url, size FROM pages ORDER BY last_access ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM pages")
+            db.commit()
+
+# Instância compartilhada do cache
+fetch_cache = FetchCache()
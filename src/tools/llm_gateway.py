@@ -0,0 +1,256 @@
+# src/tools/llm_gateway.py
+import contextvars
+import heapq
+import itertools
+import json
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+import httpx
+
+from src.tools.metrics import metrics
+
+# Prioridades (menor = atendida antes): o reduce de artigos já iniciados passa à frente de trabalho
+# novo, e o pré-processamento em segundo plano do daemon cede a vez a todo o resto
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 10
+
+_priority = contextvars.ContextVar("llm_priority", default=PRIORITY_NORMAL)
+
+@contextmanager
+def priority(level: int):
+    """Define a prioridade das chamadas ao LLM feitas neste contexto (inclusive nas threads do batch do LangChain)."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+def parse_duration(value) -> float:
+    """Converte durações dos cabeçalhos da Groq ("7.66s", "2m59.56s", "120ms") ou do Retry-After em segundos."""
+    if not value:
+        return 0.0
+    try:
+        return float(value)
+    except ValueError:
+        return sum(float(amount) * _UNITS[unit] for amount, unit in _DURATION.findall(value))
+
+class TokenBucket:
+    """Balde de fichas com reposição contínua; aceita dívida (uso real maior que o estimado)."""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60
+        self.capacity = per_minute
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        if not self.enabled:
+            return max(self.blocked_until - now, 0.0)
+        self._refill(now)
+        # Pedidos maiores que o balde esperam apenas que ele encha
+        missing = min(amount, self.capacity) - self.level
+        return max(self.blocked_until - now, missing / self.rate if missing > 0 else 0.0, 0.0)
+
+    def take(self, amount: float):
+        if self.enabled:
+            self.level -= amount
+
+    def sync(self, remaining: float, reset: float, now: float):
+        """Ajusta o saldo ao informado pelo servidor (outros processos também consomem a mesma cota)."""
+        if self.enabled:
+            self._refill(now)
+            self.level = min(self.level, remaining)
+        if remaining <= 0 and reset > 0:
+            self.blocked_until = max(self.blocked_until, now + reset)
+
+class LLMGateway:
+    """Ponto único de acesso ao LLM para todo o processo (resumos e agentes).
+
+    Todas as instâncias de `ChatGroq` compartilham um cliente httpx com pool de conexões cujo
+    transporte admite cada requisição por dois baldes de fichas (requisições e tokens estimados
+    por minuto), na ordem de prioridade; ajusta os baldes pelos cabeçalhos `x-ratelimit-*` da
+    resposta e repete 429/5xx com backoff exponencial com jitter, respeitando o Retry-After.
+    """
+
+    def __init__(self, rpm: float = None, tpm: float = None, max_retries: int = None, max_backoff: float = None,
+                 max_connections: int = None):
+        rpm = rpm if rpm is not None else float(os.getenv("LLM_RPM", "30"))
+        tpm = tpm if tpm is not None else float(os.getenv("LLM_TPM", "6000"))
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("LLM_MAX_RETRIES", "5"))
+        self.max_backoff = max_backoff if max_backoff is not None else float(os.getenv("LLM_MAX_BACKOFF", "60"))
+        self.max_connections = max_connections or int(os.getenv("LLM_MAX_CONNECTIONS", "10"))
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._http = None
+        self._models = {}
+        self.stats = {"requests": 0, "retries": 0, "rate_limited": 0, "wait_seconds": 0.0}
+
+    def acquire(self, tokens: int, level: int = None) -> float:
+        """Bloqueia até haver cota para uma requisição de `tokens` tokens; retorna o tempo de espera."""
+        entry = (_priority.get() if level is None else level, next(self._seq))
+        start = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    if self._waiting[0] != entry:
+                        # Só a requisição mais prioritária consome os baldes; as demais aguardam a vez
+                        self._cond.wait(timeout=1)
+                        continue
+                    now = time.monotonic()
+                    wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+                    if wait <= 0:
+                        self.requests.take(1)
+                        self.tokens.take(tokens)
+                        break
+                    self._cond.wait(timeout=wait)
+            finally:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+            waited = time.monotonic() - start
+            self.stats["requests"] += 1
+            self.stats["wait_seconds"] += waited
+        if waited > 0.01:
+            metrics.incr("llm_wait_seconds", round(waited, 3))
+        return waited
+
+    def observe(self, headers):
+        """Sincroniza os baldes com os limites restantes informados pela Groq."""
+        now = time.monotonic()
+        with self._cond:
+            for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+                remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+                if remaining is not None:
+                    bucket.sync(float(remaining), parse_duration(headers.get(f"x-ratelimit-reset-{kind}")), now)
+            self._cond.notify_all()
+
+    def pause(self, seconds: float):
+        """Suspende todas as requisições (429 com Retry-After): nenhuma thread insiste enquanto isso."""
+        with self._cond:
+            self.requests.blocked_until = max(self.requests.blocked_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    def reconcile(self, estimated: int, actual: int):
+        """Devolve (ou cobra) a diferença entre os tokens estimados na admissão e os realmente usados."""
+        with self._cond:
+            self.tokens.take(actual - estimated)
+            self._cond.notify_all()
+
+    def backoff(self, attempt: int, retry_after: float = 0.0) -> float:
+        # Backoff exponencial com jitter, nunca antes do que o servidor pediu
+        return max(retry_after, min(self.max_backoff, 2 ** attempt) * (0.5 + random.random()))
+
+    @staticmethod
+    def estimate(body: dict) -> int:
+        """Tokens que a requisição pode consumir: prompt (estimado) + limite de saída."""
+        from src.tools.summarizer import count_tokens  # o summarizer importa este módulo
+        prompt = " ".join(str(message.get("content") or "") for message in body.get("messages", []))
+        return count_tokens(prompt) + int(body.get("max_tokens") or body.get("max_completion_tokens") or 0)
+
+    def http_client(self):
+        """Cliente httpx único (pool de conexões keep-alive) com o transporte controlado pelo gateway."""
+        with self._lock:
+            if self._http is None:
+                self._http = httpx.Client(
+                    transport=_GatewayTransport(self, httpx.HTTPTransport(
+                        limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                    )),
+                    timeout=httpx.Timeout(float(os.getenv("LLM_TIMEOUT", "60")), connect=10),
+                )
+            return self._http
+
+    def chat_model(self, model_name: str, max_tokens: int = None):
+        """`ChatGroq` compartilhado por modelo e limite de saída; as repetições ficam a cargo do gateway."""
+        key = (model_name, max_tokens)
+        with self._lock:
+            model = self._models.get(key)
+        if model is None:
+            from langchain_groq import ChatGroq  # import pesado, feito só quando o LLM é usado
+            model = ChatGroq(
+                api_key=os.getenv("GROQ_API_KEY"), model_name=model_name, max_tokens=max_tokens,
+                max_retries=0, http_client=self.http_client(),
+            )
+            with self._lock:
+                model = self._models.setdefault(key, model)
+        return model
+
+class _GatewayTransport(httpx.BaseTransport):
+    """Transporte httpx que passa cada requisição pela admissão, adaptação e repetição do gateway."""
+
+    def __init__(self, gateway: LLMGateway, inner: httpx.BaseTransport):
+        self.gateway = gateway
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        gateway = self.gateway
+        try:
+            body = json.loads(request.content)
+        except (ValueError, httpx.RequestNotRead):
+            body = {}
+        estimate = gateway.estimate(body)
+        for attempt in range(gateway.max_retries + 1):
+            gateway.acquire(estimate)
+            try:
+                with metrics.span("llm.request"):
+                    response = self.inner.handle_request(request)
+            except httpx.TransportError:
+                if attempt >= gateway.max_retries:
+                    raise
+                gateway.stats["retries"] += 1
+                metrics.incr("retries", kind="llm")
+                time.sleep(gateway.backoff(attempt))
+                continue
+
+            gateway.observe(response.headers)
+            retryable = response.status_code == 429 or response.status_code >= 500
+            if retryable and attempt < gateway.max_retries:
+                retry_after = parse_duration(response.headers.get("retry-after"))
+                if response.status_code == 429:
+                    gateway.stats["rate_limited"] += 1
+                    metrics.incr("llm_rate_limited")
+                    gateway.pause(retry_after)
+                response.close()
+                gateway.stats["retries"] += 1
+                metrics.incr("retries", kind="llm")
+                time.sleep(gateway.backoff(attempt, retry_after))
+                continue
+
+            if response.status_code == 200 and not body.get("stream"):
+                # Corrige a estimativa com o uso real informado pela API
+                response.read()
+                try:
+                    usage = json.loads(response.content).get("usage") or {}
+                except ValueError:
+                    usage = {}
+                if usage.get("total_tokens"):
+                    gateway.reconcile(estimate, usage["total_tokens"])
+            return response
+
+    def close(self):
+        self.inner.close()
+
+# Instância compartilhada por todo o processo
+llm_gateway = LLMGateway()
@@ -0,0 +1,191 @@
+# src/tools/metrics.py
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+class RunMetrics:
+    """Coleta leve de spans de tempo e contadores de uma execução, com exportação para JSON e Prometheus.
+
+    Os spans são agregados por nome à medida que terminam; só os `max_events` mais recentes são
+    guardados individualmente, o que mantém a memória constante em processos longos (modo daemon).
+    """
+
+    def __init__(self, max_events: int = None):
+        self.max_events = max_events or int(os.getenv("METRICS_MAX_EVENTS", "10000"))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self._origin = time.perf_counter()
+            self.spans = deque(maxlen=self.max_events)
+            self.dropped_spans = 0
+            self._aggregated = {}
+            self.counters = defaultdict(float)
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        """Mede a duração de um bloco (ex.: `with metrics.span("article.fetch", url=url):`)."""
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            end = time.perf_counter()
+            record = {
+                "name": name,
+                "start": round(start - self._origin, 6),
+                "duration": round(end - start, 6),
+                "thread": threading.current_thread().name,
+                **({"labels": labels} if labels else {}),
+                **({"error": error} if error else {}),
+            }
+            with self._lock:
+                if len(self.spans) == self.spans.maxlen:
+                    self.dropped_spans += 1
+                self.spans.append(record)
+                entry = self._aggregated.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0, "errors": 0})
+                entry["count"] += 1
+                entry["total"] += record["duration"]
+                entry["max"] = max(entry["max"], record["duration"])
+                entry["errors"] += 1 if error else 0
+
+    def incr(self, name: str, value: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] += value
+
+    def summary(self) -> dict:
+        """Agrega os spans por nome (quantidade, total, média e máximo)."""
+        with self._lock:
+            aggregated = {name: dict(entry) for name, entry in self._aggregated.items()}
+            counters = dict(self.counters)
+        for entry in aggregated.values():
+            entry["mean"] = entry["total"] / entry["count"]
+        return {
+            "started_at": self.started_at,
+            "wall_time": time.perf_counter() - self._origin,
+            "spans": aggregated,
+            "counters": [
+                {"name": name, **({"labels": dict(labels)} if labels else {}), "value": value}
+                for (name, labels), value in sorted(counters.items())
+            ],
+        }
+
+    def write_json(self, path: str):
+        """Relatório completo da execução: agregados, contadores e os spans mais recentes."""
+        report = self.summary()
+        with self._lock:
+            report["events"] = list(self.spans)
+            report["events_dropped"] = self.dropped_spans
+        _write_atomic(path, json.dumps(report, indent=2, ensure_ascii=False))
+
+    def write_prometheus(self, path: str, prefix: str = "newsletter"):
+        """Arquivo no formato textfile do node_exporter (spans agregados por nome; sem rótulos de URL)."""
+        report = self.summary()
+        lines = [
+            f"# HELP {prefix}_span_seconds Duração dos spans da execução.",
+            f"# TYPE {prefix}_span_seconds summary",
+        ]
+        for name, entry in sorted(report["spans"].items()):
+            lines.append(f'{prefix}_span_seconds_sum{{span="{name}"}} {entry["total"]:.6f}')
+            lines.append(f'{prefix}_span_seconds_count{{span="{name}"}} {entry["count"]}')
+        lines.append(f"# TYPE {prefix}_span_max_seconds gauge")
+        for name, entry in sorted(report["spans"].items()):
+            lines.append(f'{prefix}_span_max_seconds{{span="{name}"}} {entry["max"]:.6f}')
+
+        declared = set()
+        for counter in report["counters"]:
+            metric = f"{prefix}_{counter['name']}_total"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} counter")
+                declared.add(metric)
+            labels = ",".join(f'{k}="{v}"' for k, v in counter.get("labels", {}).items())
+            lines.append(f"{metric}{{{labels}}} {counter['value']:g}" if labels else f"{metric} {counter['value']:g}")
+
+        lines.append(f"# TYPE {prefix}_run_wall_seconds gauge")
+        lines.append(f"{prefix}_run_wall_seconds {report['wall_time']:.6f}")
+        lines.append(f"# TYPE {prefix}_run_timestamp_seconds gauge")
+        lines.append(f"{prefix}_run_timestamp_seconds {report['started_at']:.0f}")
+        _write_atomic(path, "\n".join(lines) + "\n")
+
+def _write_atomic(path: str, content: str):
+    # O node_exporter pode ler o arquivo a qualquer momento: escreve em um temporário e renomeia
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+@contextmanager
+def profiling(enabled: bool = None, output_dir: str = None, top: int = 25):
+    """Ativa cProfile e tracemalloc durante o bloco (ou via NEWSLETTER_PROFILE=1).
+
+    O trabalho pesado roda nos pools de threads: cada thread iniciada durante o bloco recebe o seu
+    próprio perfil, somado ao da thread principal no relatório.
+    """
+    if enabled is None:
+        enabled = os.getenv("NEWSLETTER_PROFILE", "") in ("1", "true", "yes")
+    if not enabled:
+        yield
+        return
+
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    output_dir = output_dir or os.getenv("NEWSLETTER_PROFILE_DIR", "profiles")
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+
+    profilers = [cProfile.Profile()]
+    profilers_lock = threading.Lock()
+
+    def profile_thread(frame, event, arg):
+        # Chamado no primeiro evento de cada thread nova: troca este gancho pelo perfil da thread
+        profiler = cProfile.Profile()
+        with profilers_lock:
+            profilers.append(profiler)
+        profiler.enable()
+
+    tracemalloc.start()
+    # A partir do Python 3.12 o cProfile já observa todas as threads
+    per_thread = sys.version_info < (3, 12)
+    if per_thread:
+        threading.setprofile(profile_thread)
+    profilers[0].enable()
+    try:
+        yield
+    finally:
+        profilers[0].disable()
+        if per_thread:
+            threading.setprofile(None)
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        with profilers_lock:
+            stats = pstats.Stats(profilers[0])
+            for profiler in profilers[1:]:
+                stats.add(profiler)
+        profile_path = os.path.join(output_dir, f"run-{stamp}.prof")
+        stats.dump_stats(profile_path)
+        print(f"\n🔬 Perfil de CPU ({len(profilers)} thread(s)) salvo em {profile_path} (abra com `python -m pstats` ou snakeviz)")
+        stats.sort_stats("cumulative").print_stats(top)
+
+        print(f"🧠 Memória: pico de {peak / 1024 / 1024:.1f} MB, {current / 1024 / 1024:.1f} MB ao final")
+        for stat in snapshot.statistics("lineno")[:10]:
+            print(f"   {stat}")
+
+# Instância compartilhada da execução corrente
+metrics = RunMetrics()
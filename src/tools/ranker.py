@@ -0,0 +1,210 @@
+# src/tools/ranker.py
+import hashlib
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+import numpy as np
+
+from src.tools.metrics import metrics
+from src.tools.storage import KeyValueStore, cache_path
+
+# Descrição de cada tópico usada como vetor de perfil (tópicos sem descrição usam a própria consulta)
+TOPIC_PROFILES = {
+    "technology trends": [
+        "New technology products, platforms and industry trends.",
+        "Artificial intelligence, chips, software, startups and big tech companies.",
+        "Consumer electronics, cloud computing, security and emerging technology.",
+    ],
+    "user experience design UX": [
+        "User experience design, usability research and interaction design.",
+        "Product design, interface patterns, accessibility and design systems.",
+        "UX research methods, prototyping tools and designer workflows.",
+    ],
+}
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+class EmbeddingBackend(ABC):
+    """Interface dos modelos de embedding: retorna vetores normalizados (norma L2 = 1)."""
+    name: str = "base"
+
+    @property
+    def model_id(self) -> str:
+        return self.name
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Matriz (len(texts), dim) de vetores float32 normalizados."""
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """Modelo do sentence-transformers (carregado na primeira utilização)."""
+    name = "sentence-transformers"
+
+    def __init__(self, model_name: str = None, batch_size: int = None):
+        self.model_name = model_name or os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+        self.batch_size = batch_size or int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model_id(self) -> str:
+        return f"{self.name}/{self.model_name}"
+
+    def _get_model(self):
+        with self._lock:
+            if self._model is None:
+                from sentence_transformers import SentenceTransformer  # import pesado (torch)
+                self._model = SentenceTransformer(self.model_name)
+            return self._model
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = self._get_model().encode(
+            texts, batch_size=self.batch_size, normalize_embeddings=True, convert_to_numpy=True, show_progress_bar=False,
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+class HashingBackend(EmbeddingBackend):
+    """Embedding lexical por feature hashing (palavras e bigramas), sem modelo: rápido e determinístico."""
+    name = "hashing"
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    @property
+    def model_id(self) -> str:
+        return f"{self.name}/{self.dim}"
+
+    def _features(self, text: str) -> List[str]:
+        words = _TOKEN.findall(text.lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+                matrix[row, digest % self.dim] += 1.0 if (digest >> 63) & 1 else -1.0
+        return _normalize(matrix)
+
+BACKENDS = {
+    SentenceTransformerBackend.name: SentenceTransformerBackend,
+    HashingBackend.name: HashingBackend,
+}
+
+def get_backend(name: str = None) -> EmbeddingBackend:
+    name = name or os.getenv("EMBEDDING_BACKEND", SentenceTransformerBackend.name)
+    if name not in BACKENDS:
+        raise ValueError(f"Backend de embeddings desconhecido: {name}")
+    if name == SentenceTransformerBackend.name:
+        import importlib.util
+        if importlib.util.find_spec("sentence_transformers") is None:
+            print("⚠️  sentence-transformers não instalado: usando embeddings lexicais (hashing) no ranking.")
+            return HashingBackend()
+    return BACKENDS[name]()
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+class EmbeddingCache:
+    """Vetores persistidos por hash do texto e modelo (float32 em BLOB)."""
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv("EMBEDDING_CACHE_PATH") or cache_path("embeddings.sqlite3")
+        self.store = KeyValueStore(self.path, "embeddings", value_column="vector", value_type="BLOB")
+
+    @property
+    def stats(self) -> dict:
+        return self.store.stats
+
+    @staticmethod
+    def make_key(text: str, model_id: str) -> str:
+        return hashlib.sha256(f"{model_id}\n{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        return {key: np.frombuffer(blob, dtype=np.float32) for key, blob in self.store.get_many(keys).items()}
+
+    def put_many(self, vectors: Dict[str, np.ndarray]):
+        self.store.put_many({key: np.asarray(vector, dtype=np.float32).tobytes() for key, vector in vectors.items()})
+
+class ArticleRanker:
+    """Escolhe os K artigos mais relevantes e diversos de cada tópico antes da raspagem e do resumo.
+
+    Títulos e descrições são transformados em vetores (em lote, com cache persistente), pontuados
+    pela similaridade de cosseno com o perfil do tópico e selecionados por MMR (Maximal Marginal
+    Relevance), que penaliza artigos parecidos com os já escolhidos.
+    """
+
+    def __init__(self, backend: EmbeddingBackend = None, cache: EmbeddingCache = None,
+                 diversity: float = None, profiles: Dict[str, List[str]] = None):
+        self._backend = backend
+        self.cache = cache or EmbeddingCache()
+        # 0 = só relevância; 1 = só diversidade
+        self.diversity = diversity if diversity is not None else float(os.getenv("RANKER_DIVERSITY", "0.3"))
+        self.profiles = profiles or TOPIC_PROFILES
+
+    @property
+    def backend(self) -> EmbeddingBackend:
+        # O modelo só é escolhido (e carregado) quando há algo para ranquear
+        if self._backend is None:
+            self._backend = get_backend()
+        return self._backend
+
+    @staticmethod
+    def article_text(article: dict) -> str:
+        return f"{article.get('title') or ''}. {article.get('description') or ''}".strip()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Matriz (n, dim) de vetores normalizados; só textos fora do cache vão ao modelo, em um único lote."""
+        model_id = self.backend.model_id
+        keys = [self.cache.make_key(text, model_id) for text in texts]
+        known = self.cache.get_many(list(set(keys)))
+        missing = list(dict.fromkeys(text for text, key in zip(texts, keys) if key not in known))
+        metrics.incr("cache_hits", len(texts) - len(missing), cache="embedding")
+        metrics.incr("cache_misses", len(missing), cache="embedding")
+        if missing:
+            with metrics.span("rank.embed", texts=len(missing)):
+                vectors = self.backend.embed(missing)
+            learned = {self.cache.make_key(text, model_id): vector for text, vector in zip(missing, vectors)}
+            self.cache.put_many(learned)
+            known.update(learned)
+        return np.vstack([known[key] for key in keys]) if keys else np.zeros((0, 0), dtype=np.float32)
+
+    def profile(self, topic: str) -> np.ndarray:
+        """Vetor de perfil do tópico: média normalizada das descrições."""
+        vectors = self.embed(self.profiles.get(topic) or [topic])
+        return _normalize(vectors.mean(axis=0, keepdims=True))[0]
+
+    def select(self, articles: List[dict], topic: str, k: int) -> List[dict]:
+        """Os `k` artigos escolhidos por MMR, em ordem de escolha, com o campo `relevance`."""
+        if len(articles) <= 1 or k <= 0:
+            return [{**a, 'relevance': None} for a in articles[:max(k, 0)]]
+        vectors = self.embed([self.article_text(a) for a in articles])
+        relevance = vectors @ self.profile(topic)
+
+        chosen = []
+        # Maior similaridade de cada candidato com algum artigo já escolhido
+        redundancy = np.full(len(articles), -np.inf, dtype=np.float32)
+        available = np.ones(len(articles), dtype=bool)
+        for _ in range(min(k, len(articles))):
+            penalty = np.where(np.isfinite(redundancy), redundancy, 0.0)
+            scores = (1 - self.diversity) * relevance - self.diversity * penalty
+            scores[~available] = -np.inf
+            best = int(np.argmax(scores))
+            chosen.append(best)
+            available[best] = False
+            redundancy = np.maximum(redundancy, vectors @ vectors[best])
+        return [{**articles[i], 'relevance': round(float(relevance[i]), 4)} for i in chosen]
+
+    def top_k(self, results: Dict[str, List[dict]], k: int) -> Dict[str, List[dict]]:
+        """Aplica `select` a cada tópico de um resultado de `search_many`."""
+        with metrics.span("stage.rank"):
+            ranked = {topic: self.select(articles, topic, k) for topic, articles in results.items()}
+        for topic, articles in results.items():
+            metrics.incr("ranker_dropped", len(articles) - len(ranked[topic]))
+            if len(articles) > k:
+                print(f"🎯 '{topic}': {len(ranked[topic])} de {len(articles)} candidatos selecionados por relevância.")
+        return ranked
@@ -0,0 +1,86 @@
+# src/tools/storage.py
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List
+
+def cache_path(filename: str) -> str:
+    """Retorna o caminho de um arquivo dentro do diretório de cache local.
+
+    O diretório só é criado por connect(), na primeira utilização: os caches compartilhados
+    (fetch_cache, summary_cache...) são instanciados ao importar os módulos.
+    """
+    return os.path.join(os.getenv("NEWSLETTER_CACHE_DIR", ".cache"), filename)
+
+def connect(path: str) -> sqlite3.Connection:
+    """Abre uma conexão SQLite segura para uso entre threads e processos."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    # WAL permite leituras concorrentes enquanto outro processo escreve
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+class KeyValueStore:
+    """Tabela chave -> valor em SQLite, criada na primeira utilização, com validade opcional (TTL em segundos).
+
+    Base dos caches de lote (fragmentos, embeddings, memória de tradução): leituras e escritas
+    de muitas chaves por vez, compartilhadas entre threads e processos.
+    """
+
+    def __init__(self, path: str, table: str, value_column: str = "value", value_type: str = "TEXT", ttl: float = None):
+        self.path = path
+        self.table = table
+        self.value_column = value_column
+        self.value_type = value_type
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = None
+        self.stats = {"hits": 0, "misses": 0}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = connect(self.path)
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    key TEXT PRIMARY KEY,
+                    {self.value_column} {self.value_type} NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def get_many(self, keys: List[str]) -> Dict[str, object]:
+        found = {}
+        # Sem TTL, nenhum registro expira
+        oldest = time.time() - self.ttl if self.ttl else 0
+        with self._lock:
+            db = self._db()
+            # Consulta em blocos para respeitar o limite de parâmetros do SQLite
+            for start in range(0, len(keys), 500):
+                block = keys[start:start + 500]
+                placeholders = ",".join("?" * len(block))
+                for key, value in db.execute(
+                    f"SELECT key, {self.value_column} FROM {self.table} WHERE key IN ({placeholders}) AND created_at >= ?",
+                    [*block, oldest],
+                ):
+                    found[key] = value
+            self.stats["hits"] += len(found)
+            self.stats["misses"] += len(set(keys)) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, object]):
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, {self.value_column}, created_at) VALUES (?, ?, ?)",
+                [(key, value, now) for key, value in items.items()],
+            )
+            if self.ttl:
+                db.execute(f"DELETE FROM {self.table} WHERE created_at < ?", (now - self.ttl,))
+            db.commit()
@@ -0,0 +1,221 @@
+# src/tools/summarizer.py
+import bisect
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List
+
+from src.tools.llm_gateway import PRIORITY_HIGH, priority
+from src.tools.metrics import metrics
+
+# Mesmo prompt padrão da cadeia map_reduce do LangChain
+SUMMARY_PROMPT = 'Write a concise summary of the following:\n\n\n"{text}"\n\n\nCONCISE SUMMARY:'
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+def count_tokens(text: str) -> int:
+    """Conta tokens com o tiktoken quando disponível; caso contrário, estima ~4 caracteres por token."""
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+@dataclass
+class SummaryStats:
+    """Custo de resumir um artigo."""
+    strategy: str = ""
+    chunks: int = 0
+    llm_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    reduce_levels: int = 0
+
+@dataclass
+class FakeMessage:
+    """Resposta no formato de uma mensagem de chat do LangChain (conteúdo + uso de tokens)."""
+    content: str
+    usage_metadata: dict = field(default_factory=dict)
+
+class FakeChatModel:
+    """LLM local determinístico para benchmarks e execuções offline.
+
+    Devolve as primeiras palavras do texto recebido, com latência simulada por chamada e por token.
+    """
+
+    def __init__(self, latency: float = None, latency_per_token: float = None, max_output_tokens: int = 512):
+        self.latency = latency if latency is not None else float(os.getenv("FAKE_LLM_LATENCY", "0"))
+        self.latency_per_token = latency_per_token if latency_per_token is not None else float(os.getenv("FAKE_LLM_LATENCY_PER_TOKEN", "0"))
+        # Saída bem menor que o limite, como um resumo real
+        self.max_output_words = max(1, max_output_tokens // 8)
+
+    def invoke(self, prompt: str) -> FakeMessage:
+        text = prompt.split('"', 1)[-1].rsplit('"', 1)[0]
+        content = " ".join(text.split()[:self.max_output_words])
+        input_tokens, output_tokens = count_tokens(prompt), count_tokens(content)
+        delay = self.latency + self.latency_per_token * (input_tokens + output_tokens)
+        if delay:
+            time.sleep(delay)
+        return FakeMessage(content, {"input_tokens": input_tokens, "output_tokens": output_tokens})
+
+    def batch(self, prompts: List[str], config: dict = None) -> List[FakeMessage]:
+        workers = (config or {}).get("max_concurrency") or len(prompts)
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(prompts)))) as executor:
+            return list(executor.map(self.invoke, prompts))
+
+class SummarizationEngine:
+    """Resume textos respeitando a janela de contexto do modelo.
+
+    Documentos que cabem na janela são resumidos com uma única chamada ("stuff"). Os demais são
+    fatiados por tokens, os pedaços são resumidos em paralelo (API de batch do LLM) e os resumos
+    parciais são combinados, hierarquicamente apenas quando não cabem em uma única chamada.
+    """
+
+    def __init__(self, llm, context_window: int = 8192, max_output_tokens: int = 512,
+                 chunk_overlap_tokens: int = 100, max_concurrency: int = None, safety_margin: float = 0.9):
+        self.llm = llm
+        self.context_window = context_window
+        self.max_output_tokens = max_output_tokens
+        self.chunk_overlap_tokens = chunk_overlap_tokens
+        self.max_concurrency = max_concurrency or int(os.getenv("SUMMARY_LLM_CONCURRENCY", "4"))
+        # O tokenizer do modelo difere do tiktoken: a margem evita estourar a janela
+        prompt_tokens = count_tokens(SUMMARY_PROMPT.format(text=""))
+        self.input_budget = int((context_window - max_output_tokens - prompt_tokens) * safety_margin)
+
+    def params(self) -> dict:
+        """Parâmetros que alteram o resultado (usados na chave do cache de resumos)."""
+        return {
+            "engine": "token-budget",
+            "context_window": self.context_window,
+            "max_output_tokens": self.max_output_tokens,
+            "chunk_overlap_tokens": self.chunk_overlap_tokens,
+            "input_budget": self.input_budget,
+        }
+
+    def _sentences(self, text: str) -> List[str]:
+        # Sentenças maiores que a janela são quebradas por tokens
+        pieces = []
+        for sentence in _SENTENCE_BOUNDARY.split(text):
+            if count_tokens(sentence) <= self.input_budget:
+                pieces.append(sentence)
+            else:
+                pieces.extend(self._slice_tokens(sentence))
+        return [piece for piece in pieces if piece.strip()]
+
+    def _slice_tokens(self, text: str) -> List[str]:
+        """Fatia um texto em trechos de até `input_budget` tokens, codificando-o uma única vez."""
+        encoding, budget = _encoding(), self.input_budget
+        if encoding is not None:
+            # Posição (em caracteres) onde começa cada token
+            _, offsets = encoding.decode_with_offsets(encoding.encode(text, disallowed_special=()))
+        else:
+            # Mesma estimativa de count_tokens (~4 caracteres por token, +1)
+            offsets, budget = list(range(0, len(text), 4)), budget - 1
+        pieces, start, begin = [], 0, 0
+        while True:
+            end = start + budget
+            if end >= len(offsets):
+                pieces.append(text[begin:])
+                break
+            # Prefere cortar no último espaço da janela para não partir palavras
+            cut = text.rfind(" ", begin + 1, offsets[end] + 1)
+            if cut <= begin:
+                cut = offsets[end]
+            pieces.append(text[begin:cut])
+            # O próximo trecho começa no token que contém o corte
+            begin, start = cut, bisect.bisect_right(offsets, cut) - 1
+        return [piece.strip() for piece in pieces]
+
+    def _split(self, text: str) -> List[str]:
+        """Agrupa sentenças em pedaços de até `input_budget` tokens, com sobreposição entre pedaços."""
+        with metrics.span("article.chunk"):
+            return self._pack(self._sentences(text))
+
+    def _pack(self, sentences: List[str]) -> List[str]:
+        sizes = [count_tokens(" " + sentence) for sentence in sentences]
+        chunks, start = [], 0
+        while start < len(sentences):
+            end, total = start, 0
+            while end < len(sentences) and (end == start or total + sizes[end] <= self.input_budget):
+                total += sizes[end]
+                end += 1
+            chunks.append(" ".join(sentences[start:end]))
+            if end >= len(sentences):
+                break
+            # Recua algumas sentenças para manter contexto entre pedaços vizinhos
+            overlap_start, overlap = end, 0
+            while overlap_start - 1 > start and overlap + sizes[overlap_start - 1] <= self.chunk_overlap_tokens:
+                overlap_start -= 1
+                overlap += sizes[overlap_start]
+            start = overlap_start
+        return chunks
+
+    def _record(self, stats: SummaryStats, prompt: str, message) -> str:
+        content = getattr(message, "content", message)
+        usage = getattr(message, "usage_metadata", None) or {}
+        stats.llm_calls += 1
+        stats.input_tokens += usage.get("input_tokens") or count_tokens(prompt)
+        stats.output_tokens += usage.get("output_tokens") or count_tokens(content)
+        return content.strip()
+
+    def _call_many(self, texts: List[str], stats: SummaryStats, deadline: float = None) -> List[str]:
+        if deadline is not None and time.monotonic() >= deadline:
+            # O artigo já foi descartado pelo prazo: não gasta mais chamadas com ele
+            raise TimeoutError("prazo do artigo esgotado")
+        prompts = [SUMMARY_PROMPT.format(text=text) for text in texts]
+        if len(prompts) == 1:
+            with metrics.span("llm.call"):
+                message = self.llm.invoke(prompts[0])
+            return [self._record(stats, prompts[0], message)]
+        with metrics.span("llm.batch", calls=len(prompts)):
+            messages = self.llm.batch(prompts, config={"max_concurrency": self.max_concurrency})
+        return [self._record(stats, prompt, message) for prompt, message in zip(prompts, messages)]
+
+    def _group(self, summaries: List[str]) -> List[str]:
+        # Junta resumos parciais em grupos que caibam na janela de contexto
+        groups, current, size = [], [], 0
+        for summary in summaries:
+            tokens = count_tokens(summary)
+            if current and size + tokens > self.input_budget:
+                groups.append("\n\n".join(current))
+                current, size = [], 0
+            current.append(summary)
+            size += tokens
+        if current:
+            groups.append("\n\n".join(current))
+        return groups
+
+    def summarize(self, text: str, deadline: float = None):
+        """Retorna (resumo, estatísticas); desiste entre chamadas ao LLM depois de `deadline` (time.monotonic)."""
+        stats = SummaryStats()
+        if count_tokens(text) <= self.input_budget:
+            stats.strategy = "stuff"
+            stats.chunks = 1
+            return self._call_many([text], stats, deadline)[0], stats
+
+        stats.strategy = "map_reduce"
+        chunks = self._split(text)
+        stats.chunks = len(chunks)
+        summaries = self._call_many(chunks, stats, deadline)
+
+        # Reduce hierárquico: só há mais de um nível quando os resumos parciais não cabem juntos.
+        # Tem prioridade no gateway: concluir um artigo já iniciado vale mais que começar outro
+        while len(summaries) > 1:
+            stats.reduce_levels += 1
+            groups = self._group(summaries)
+            if len(groups) == len(summaries) and len(groups) > 1:
+                # Cada resumo já ocupa uma janela inteira: combina de dois em dois para garantir progresso
+                groups = ["\n\n".join(summaries[i:i + 2]) for i in range(0, len(summaries), 2)]
+            with priority(PRIORITY_HIGH):
+                summaries = self._call_many(groups, stats, deadline)
+        return summaries[0], stats
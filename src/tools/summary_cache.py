@@ -0,0 +1,125 @@
+# src/tools/summary_cache.py
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Optional
+
+from src.tools.storage import cache_path, connect
+
+def normalize_text(text: str) -> str:
+    """Normaliza espaços para que variações de formatação gerem a mesma chave."""
+    return re.sub(r"\s+", " ", text).strip()
+
+class SummaryCache:
+    """Armazena resumos por hash do conteúdo, modelo e parâmetros de fatiamento (compartilhado entre processos)."""
+
+    def __init__(self, path: str = None, ttl: float = None, max_entries: int = None):
+        self.path = path or os.getenv("SUMMARY_CACHE_PATH") or cache_path("summary_cache.sqlite3")
+        self.ttl = ttl if ttl is not None else float(os.getenv("SUMMARY_CACHE_TTL", str(30 * 86400)))
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "5000"))
+        self._lock = threading.Lock()
+        self._conn = None
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect(self.path)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS summaries (
+                    key TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS summaries_last_access ON summaries (last_access)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(text: str, model: str, params: dict) -> str:
+        payload = json.dumps({"model": model, "params": params}, sort_keys=True) + "\n" + normalize_text(text)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT summary, created_at FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.stats["misses"] += 1
+                return None
+            db.execute("UPDATE summaries SET last_access = ? WHERE key = ?", (now, key))
+            db.commit()
+            self.stats["hits"] += 1
+            return row[0]
+
+    def put(self, key: str, summary: str, model: str, params: dict):
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary, model, params, created_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, summary, model, json.dumps(params, sort_keys=True), now, now),
+            )
+            self._evict(db, now)
+            db.commit()
+
+    def _evict(self, db, now: float):
+        # Remove expirados e, se ainda necessário, os menos usados recentemente
+        removed = db.execute("DELETE FROM summaries WHERE created_at < ?", (now - self.ttl,)).rowcount
+        count = db.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        if count > self.max_entries:
+            removed += db.execute(
+                "DELETE FROM summaries WHERE key IN (SELECT key FROM summaries ORDER BY last_access ASC LIMIT ?)",
+                (count - self.max_entries,),
+            ).rowcount
+        self.stats["evictions"] += removed
+
+    def invalidate(self, model: str = None, older_than: float = None) -> int:
+        """Remove resumos (todos, de um modelo, ou criados há mais de `older_than` segundos)."""
+        query = "DELETE FROM summaries WHERE 1=1"
+        args = []
+        if model:
+            query += " AND model = ?"
+            args.append(model)
+        if older_than is not None:
+            query += " AND created_at < ?"
+            args.append(time.time() - older_than)
+        with self._lock:
+            db = self._db()
+            removed = db.execute(query, args).rowcount
+            db.commit()
+            return removed
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db().execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+
+# Instância compartilhada do cache
+summary_cache = SummaryCache()
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerencia o cache de resumos gerados pelo LLM.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Mostra o número de resumos armazenados")
+    clear = sub.add_parser("clear", help="Invalida resumos armazenados")
+    clear.add_argument("--model", help="Remove apenas resumos deste modelo")
+    clear.add_argument("--older-than-days", type=float, help="Remove apenas resumos mais antigos que N dias")
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        print(f"📦 {summary_cache.count()} resumos em {summary_cache.path}")
+    else:
+        older_than = args.older_than_days * 86400 if args.older_than_days is not None else None
+        removed = summary_cache.invalidate(model=args.model, older_than=older_than)
+        print(f"🗑️  {removed} resumos removidos de {summary_cache.path}")
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,29 @@
 # src/tools/summary_tool.py
+import codecs
 import os
-from langchain.chains.summarize import load_summarize_chain
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_groq import ChatGroq
-from bs4 import BeautifulSoup
+import re
+import threading
+import time
 import requests
 from typing import Type
 from pydantic import BaseModel, Field
 
+from src.tools.compressor import ExtractiveCompressor
+from src.tools.extractor import ArticleExtractor, get_extractor
+from src.tools.fetch_cache import FetchCache, fetch_cache
+from src.tools.llm_gateway import llm_gateway
+from src.tools.metrics import metrics
+from src.tools.summary_cache import SummaryCache, summary_cache
+from src.tools.summarizer import FakeChatModel, SummarizationEngine, SummaryStats
+
+# Tipos de conteúdo que podem conter um artigo (sem Content-Type, a página é aceita)
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+class UnsupportedContentError(Exception):
+    """A URL aponta para algo que não é uma página HTML (PDF, imagem, vídeo, JSON...)."""
+
 class SummaryInput(BaseModel):
     """Input schema for SummaryTool."""
     url: str = Field(..., description="URL of the website to summarize")
@@ -17,103 +33,265 @@ class SummaryTool:
     description: str = "Recebe uma URL de website, extrai seu conteúdo e gera um resumo conciso."
     args_schema: Type[BaseModel] = SummaryInput
 
-    def _run(self, url: str) -> str:
-        """Execute the tool."""
+    # Headers para simular um navegador real
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+    }
+
+    # Parâmetros do resumo (fazem parte da chave do cache de resumos)
+    model_name: str = "llama3-8b-8192"
+    context_window: int = 8192
+    max_output_tokens: int = 512
+    chunk_overlap_tokens: int = 100
+
+    def __init__(self, cache: FetchCache = None, summaries: SummaryCache = None, extractor: ArticleExtractor = None,
+                 compressor: ExtractiveCompressor = None, max_bytes: int = None, enough_text_chars: int = None):
+        self.cache = cache or fetch_cache
+        self.summaries = summaries or summary_cache
+        self.extractor = extractor or get_extractor()
+        self.compressor = compressor or ExtractiveCompressor()
+        # Limites do download em streaming: bytes (já descomprimidos) e texto de artigo suficiente
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("FETCH_MAX_BYTES", str(2 * 1024 * 1024)))
+        self.enough_text_chars = enough_text_chars if enough_text_chars is not None else int(os.getenv("FETCH_ENOUGH_TEXT_CHARS", "40000"))
+        # Custo (chamadas e tokens) do último resumo de cada URL
+        self.article_stats = {}
+        self._stats_lock = threading.Lock()
+
+    def _make_llm(self):
+        if self._model_key() == "fake":
+            # LLM local para benchmarks e execuções offline
+            return FakeChatModel(max_output_tokens=self.max_output_tokens)
+        # Cliente compartilhado: pool de conexões e limites de requisições/tokens da Groq para todo o processo
+        return llm_gateway.chat_model(self.model_name, max_tokens=self.max_output_tokens)
+
+    def _make_engine(self, llm=None) -> SummarizationEngine:
+        # Sem `llm`, o motor serve só para calcular os parâmetros da chave do cache
+        return SummarizationEngine(
+            llm,
+            context_window=self.context_window,
+            max_output_tokens=self.max_output_tokens,
+            chunk_overlap_tokens=self.chunk_overlap_tokens,
+        )
+
+    def _model_key(self) -> str:
+        # Resumos do LLM falso (SUMMARY_LLM_BACKEND=fake) nunca se misturam aos do modelo real no cache
+        return "fake" if os.getenv("SUMMARY_LLM_BACKEND", "groq") == "fake" else self.model_name
+
+    def _summary_params(self) -> dict:
+        return {**self._make_engine().params(), **self.compressor.params()}
+
+    def _record_stats(self, url: str, stats: SummaryStats):
+        with self._stats_lock:
+            self.article_stats[url] = stats
+
+    @staticmethod
+    def _remaining(deadline: float = None) -> float:
+        """Segundos até o prazo do artigo (TimeoutError se já passou); sem prazo, o timeout padrão."""
+        if deadline is None:
+            return 15
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("prazo do artigo esgotado")
+        return min(15, remaining)
+
+    @staticmethod
+    def _retry_after(response: requests.Response, default: float = 2.0) -> float:
+        """Segundos pedidos pelo cabeçalho Retry-After (só a forma numérica); `default` sem ele."""
+        try:
+            return max(0.0, float(response.headers.get('Retry-After', default)))
+        except ValueError:
+            return default
+
+    @staticmethod
+    def _iter_body(response: requests.Response):
+        # read1 devolve o que já chegou (iter_content espera juntar o pedaço inteiro), o que permite
+        # checar o prazo mesmo em páginas que pingam bytes devagar
+        if hasattr(response.raw, "read1"):
+            while True:
+                chunk = response.raw.read1(16384, decode_content=True)
+                if not chunk:
+                    return
+                yield chunk
+        else:
+            yield from response.iter_content(chunk_size=16384)
+
+    @staticmethod
+    def _decoder(response: requests.Response, head: bytes):
+        # Sem charset no cabeçalho, o requests supõe ISO-8859-1; o <meta charset> da página (ou UTF-8) é mais fiel
+        encoding = None
+        if "charset" in response.headers.get('Content-Type', '').lower():
+            encoding = response.encoding
+        else:
+            match = _META_CHARSET.search(head[:4096])
+            encoding = match.group(1).decode("ascii", "replace") if match else "utf-8"
+        try:
+            return codecs.getincrementaldecoder(encoding)(errors="replace")
+        except LookupError:
+            return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def _read_page(self, response: requests.Response, deadline: float = None) -> str:
+        """Lê o corpo em pedaços, parando no limite de bytes ou quando já há texto de artigo suficiente,
+        e retorna o texto extraído (com lxml, a página é analisada uma única vez, durante o download)."""
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type and content_type not in HTML_CONTENT_TYPES:
+            raise UnsupportedContentError(content_type)
+
+        probe = self.extractor.probe(self.enough_text_chars)
+        decoder = None
+        chunks, size, cutoff = [], 0, None
+        for chunk in self._iter_body(response):
+            self._remaining(deadline)
+            chunk = chunk[:self.max_bytes - size]
+            chunks.append(chunk)
+            size += len(chunk)
+            if decoder is None:
+                decoder = self._decoder(response, chunk)
+            probe.feed(decoder.decode(chunk))
+            if size >= self.max_bytes:
+                cutoff = "max_bytes"
+                break
+            if probe.done:
+                cutoff = "enough_text"
+                break
+        if decoder is not None:
+            probe.feed(decoder.decode(b"", final=True))
+        metrics.incr("bytes_downloaded", size)
+        if cutoff:
+            # O extrator tolera HTML truncado; o restante da página nem chega a ser baixado
+            metrics.incr("fetch_truncated", reason=cutoff)
+            print(f"✂️  Download interrompido após {size} bytes ({cutoff}).")
+        with metrics.span("article.parse"):
+            return self.extractor.extract_probe(probe, b"".join(chunks))
+
+    def _fetch_text(self, url: str, deadline: float = None) -> str:
+        """Baixa a página (usando o cache com revalidação condicional) e retorna o texto extraído."""
+        entry = self.cache.get(url)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.record("hits")
+            metrics.incr("cache_hits", cache="fetch")
+            print("♻️  Conteúdo encontrado no cache local.")
+            return entry.text
+        
+        request_headers = dict(self.headers)
+        if entry is not None:
+            request_headers.update(self.cache.conditional_headers(entry))
+        
+        with metrics.span("article.fetch", url=url):
+            with requests.get(url, headers=request_headers, timeout=self._remaining(deadline), stream=True) as response:
+                if response.status_code == 304 and entry is not None:
+                    # Página não mudou: reaproveita a extração armazenada
+                    self.cache.touch(url)
+                    self.cache.record("revalidated")
+                    metrics.incr("cache_hits", cache="fetch_revalidated")
+                    print("♻️  Página não modificada (304), usando conteúdo do cache.")
+                    return entry.text
+                response.raise_for_status()
+                full_text = self._read_page(response, deadline)
+        self.cache.record("misses")
+        metrics.incr("cache_misses", cache="fetch")
+        
+        if full_text.strip():
+            self.cache.put(
+                url,
+                full_text,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+            )
+        return full_text
+
+    def extract(self, url: str, deadline: float = None):
+        """Raspa a URL e retorna (texto, None) ou (None, mensagem de erro).
+
+        Com `deadline` (time.monotonic), o download desiste ao atingir o prazo do artigo.
+        """
         print(f"\n--- [SummaryTool] Iniciando para a URL: {url} ---")
-        llm = ChatGroq(api_key=os.getenv("GROQ_API_KEY"), model_name="llama3-8b-8192")
         
         print("Etapa 1: Raspando o conteúdo do site...")
         
-        # Headers para simular um navegador real
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-        
         try:
             # Primeiro tentativa com headers personalizados
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remover scripts e estilos
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Tentar extrair conteúdo de diferentes tags
-            content_selectors = [
-                'article',
-                '.article-content',
-                '.content',
-                '.post-content',
-                '.story-body',
-                'main',
-                '[role="main"]'
-            ]
+            full_text = self._fetch_text(url, deadline)
             
-            full_text = ""
-            
-            # Tentar seletores específicos primeiro
-            for selector in content_selectors:
-                elements = soup.select(selector)
-                if elements:
-                    text_elements = elements[0].find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-                    if text_elements:
-                        full_text = ' '.join([elem.get_text().strip() for elem in text_elements if elem.get_text().strip()])
-                        break
-            
-            # Se não encontrou conteúdo específico, usar método geral
             if not full_text.strip():
-                text_elements = soup.find_all(['p', 'h1', 'h2', 'h3'])
-                full_text = ' '.join([elem.get_text().strip() for elem in text_elements if elem.get_text().strip()])
-            
-            if not full_text.strip():
-                return "Não foi possível extrair conteúdo textual significativo da URL."
+                return None, "Não foi possível extrair conteúdo textual significativo da URL."
                 
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 429:
-                print("⚠️  Rate limit atingido, aguardando...")
-                import time
-                time.sleep(2)
+                try:
+                    # Espera o Retry-After do site (2s sem ele), sem passar do prazo do artigo
+                    delay = min(self._retry_after(e.response), self._remaining(deadline))
+                except TimeoutError:
+                    return None, f"Site temporariamente indisponível (Rate limit) e prazo do artigo esgotado. Erro: {e}"
+                print(f"⚠️  Rate limit atingido, aguardando {delay:.1f}s...")
+                metrics.incr("retries", kind="page_fetch")
+                time.sleep(delay)
                 try:
                     # Segunda tentativa após delay
-                    response = requests.get(url, headers=headers, timeout=15)
-                    response.raise_for_status()
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    text_elements = soup.find_all(['p', 'h1', 'h2', 'h3'])
-                    full_text = ' '.join([elem.get_text().strip() for elem in text_elements if elem.get_text().strip()])
+                    full_text = self._fetch_text(url, deadline)
                     if not full_text.strip():
-                        return "Não foi possível extrair conteúdo textual significativo da URL após segunda tentativa."
+                        return None, "Não foi possível extrair conteúdo textual significativo da URL após segunda tentativa."
                 except:
-                    return f"Site temporariamente indisponível (Rate limit). Erro: {e}"
+                    return None, f"Site temporariamente indisponível (Rate limit). Erro: {e}"
             elif e.response.status_code in [403, 420]:
-                return f"Site bloqueou o acesso automatizado. Erro: {e}"
+                return None, f"Site bloqueou o acesso automatizado. Erro: {e}"
             else:
-                return f"Erro HTTP ao acessar a URL: {e}"
+                return None, f"Erro HTTP ao acessar a URL: {e}"
+        except UnsupportedContentError as e:
+            return None, f"Conteúdo não é uma página HTML ({e})."
         except Exception as e:
-            return f"Erro ao acessar ou processar a URL: {e}"
+            return None, f"Erro ao acessar ou processar a URL: {e}"
 
-        print("Etapa 2: Fatiando o texto para análise...")
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=2000, chunk_overlap=200)
-        docs = text_splitter.create_documents([full_text])
+        return full_text, None
 
-        if not docs:
-            return "O conteúdo da página era muito curto para gerar um resumo."
+    def summarize_text(self, url: str, full_text: str, deadline: float = None) -> str:
+        """Resume o texto já extraído de uma URL (sem novas chamadas ao LLM depois de `deadline`)."""
+        # Conteúdo idêntico já resumido (mesma matéria em outra URL, reexecuções) não volta ao LLM
+        params = self._summary_params()
+        summary_key = self.summaries.make_key(full_text, self._model_key(), params)
+        cached_summary = self.summaries.get(summary_key)
+        if cached_summary is not None:
+            metrics.incr("cache_hits", cache="summary")
+            print("--- [SummaryTool] Sucesso: Resumo reaproveitado do cache. ---")
+            return cached_summary
 
-        print(f"Etapa 3: Iniciando a cadeia de resumo com {len(docs)} pedaços (chunks)...")
+        metrics.incr("cache_misses", cache="summary")
+        # Só as sentenças centrais do artigo vão ao LLM: menos pedaços e menos chamadas à Groq
+        with metrics.span("article.compress"):
+            compressed_text, compression = self.compressor.compress(full_text)
+        metrics.incr("compression_tokens", compression.input_tokens, stage="input")
+        metrics.incr("compression_tokens", compression.output_tokens, stage="output")
+        print(f"Etapa 2: Compressão extrativa: {compression.input_tokens} → {compression.output_tokens} tokens "
+              f"({compression.ratio:.0%}), {compression.kept}/{compression.sentences} sentenças mantidas, "
+              f"{compression.boilerplate} de boilerplate removidas.")
+        print("Etapa 3: Planejando o resumo pela janela de contexto do modelo...")
         try:
-            summarize_chain = load_summarize_chain(llm=llm, chain_type="map_reduce")
-            # Usando .invoke() que é o método moderno do LangChain
-            summary_output = summarize_chain.invoke({"input_documents": docs})
-            summary = summary_output.get("output_text", "Não foi possível gerar o resumo.")
-            print("--- [SummaryTool] Sucesso: Resumo gerado. ---")
-            return summary
+            summary, stats = self._make_engine(self._make_llm()).summarize(compressed_text, deadline=deadline)
         except Exception as e:
             return f"Erro ao gerar o resumo com o LLM: {e}"
 
+        self._record_stats(url, stats)
+        metrics.incr("llm_calls", stats.llm_calls)
+        metrics.incr("llm_tokens", stats.input_tokens, direction="input")
+        metrics.incr("llm_tokens", stats.output_tokens, direction="output")
+        print(f"Etapa 4: Resumo via '{stats.strategy}' com {stats.chunks} pedaço(s): "
+              f"{stats.llm_calls} chamada(s) ao LLM, {stats.input_tokens} tokens de entrada, {stats.output_tokens} de saída.")
+        if not summary:
+            return "Não foi possível gerar o resumo."
+        self.summaries.put(summary_key, summary, self._model_key(), params)
+        print("--- [SummaryTool] Sucesso: Resumo gerado. ---")
+        return summary
+
+    def _run(self, url: str) -> str:
+        """Execute the tool."""
+        full_text, error = self.extract(url)
+        if error:
+            return error
+        return self.summarize_text(url, full_text)
+
 # Instância da ferramenta
 summary_tool = SummaryTool()
\ No newline at end of file
@@ -0,0 +1,197 @@
+# src/tools/translation.py
+import hashlib
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from src.tools.metrics import metrics
+from src.tools.storage import KeyValueStore, cache_path
+
+class TranslationBackend(ABC):
+    """Interface dos tradutores: traduz uma lista de segmentos em uma única requisição."""
+    name: str = "base"
+    # Tamanho máximo (em caracteres) aceito pelo backend em uma requisição
+    max_chars: int = 4500
+
+    def __init__(self, source: str = "en", target: str = "pt"):
+        self.source = source
+        self.target = target
+
+    @abstractmethod
+    def translate_batch(self, segments: List[str]) -> List[str]:
+        """Traduz os segmentos mantendo a ordem (uma tradução por segmento)."""
+
+class GoogleTranslateBackend(TranslationBackend):
+    """Google Translate via deep_translator, empacotando vários segmentos por requisição."""
+    name = "google"
+    max_chars = 4500  # o limite da API é 5000 caracteres
+    separator = "\n"
+
+    def __init__(self, source: str = "en", target: str = "pt"):
+        super().__init__(source, target)
+        self._local = threading.local()
+
+    def _translator(self):
+        # Um tradutor por thread, reaproveitado entre lotes
+        if not hasattr(self._local, "translator"):
+            from deep_translator import GoogleTranslator
+            self._local.translator = GoogleTranslator(source=self.source, target=self.target)
+        return self._local.translator
+
+    def translate_batch(self, segments: List[str]) -> List[str]:
+        translator = self._translator()
+        translated = translator.translate(self.separator.join(segments)) or ""
+        lines = translated.split(self.separator)
+        if len(lines) == len(segments):
+            return [line.strip() for line in lines]
+        # O serviço juntou ou quebrou linhas: traduz segmento a segmento para manter o alinhamento
+        return [translator.translate(segment) or segment for segment in segments]
+
+class FakeTranslatorBackend(TranslationBackend):
+    """Tradutor local determinístico para benchmarks e execuções offline."""
+    name = "fake"
+
+    def __init__(self, source: str = "en", target: str = "pt", latency: float = None):
+        super().__init__(source, target)
+        self.latency = latency if latency is not None else float(os.getenv("FAKE_TRANSLATOR_LATENCY", "0"))
+        self.calls = 0
+
+    def translate_batch(self, segments: List[str]) -> List[str]:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return [f"[{self.target}] {segment}" for segment in segments]
+
+BACKENDS = {
+    GoogleTranslateBackend.name: GoogleTranslateBackend,
+    FakeTranslatorBackend.name: FakeTranslatorBackend,
+}
+
+def get_backend(name: str = None, source: str = "en", target: str = "pt") -> TranslationBackend:
+    name = name or os.getenv("TRANSLATION_BACKEND", "google")
+    if name not in BACKENDS:
+        raise ValueError(f"Backend de tradução desconhecido: {name}")
+    return BACKENDS[name](source=source, target=target)
+
+class TranslationMemory:
+    """Memória de tradução persistente por segmento (hash do texto de origem -> tradução)."""
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv("TRANSLATION_MEMORY_PATH") or cache_path("translation_memory.sqlite3")
+        self.store = KeyValueStore(self.path, "segments", value_column="translation")
+
+    @property
+    def stats(self) -> dict:
+        return self.store.stats
+
+    @staticmethod
+    def make_key(segment: str, source: str, target: str, backend: str) -> str:
+        # O backend faz parte da chave: traduções do tradutor falso nunca chegam a leitores reais
+        return hashlib.sha256(f"{backend}|{source}|{target}|{segment}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> dict:
+        return self.store.get_many(keys)
+
+    def put_many(self, items: dict):
+        self.store.put_many(items)
+
+# Separa sentenças mantendo a pontuação final
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+class TranslationEngine:
+    """Traduz textos em lote: segmenta, consulta a memória, empacota e envia lotes em paralelo."""
+
+    def __init__(self, backend: TranslationBackend = None, memory: TranslationMemory = None, max_workers: int = None):
+        self.backend = backend or get_backend()
+        self.memory = memory or TranslationMemory()
+        self.max_workers = max_workers or int(os.getenv("TRANSLATION_MAX_WORKERS", "4"))
+
+    def _segment(self, text: str) -> List[str]:
+        segments = []
+        for sentence in _SENTENCE_BOUNDARY.split(text.strip()):
+            # Quebras de linha dentro do segmento (comuns nos resumos do LLM) desalinhariam o lote,
+            # que usa uma linha por segmento
+            sentence = " ".join(sentence.split())
+            if not sentence:
+                continue
+            # Sentenças maiores que o limite do backend são quebradas em palavras
+            while len(sentence) > self.backend.max_chars:
+                cut = sentence.rfind(" ", 0, self.backend.max_chars)
+                cut = cut if cut > 0 else self.backend.max_chars
+                segments.append(sentence[:cut].strip())
+                sentence = sentence[cut:].strip()
+            if sentence:
+                segments.append(sentence)
+        return segments
+
+    def _pack(self, segments: List[str]) -> List[List[str]]:
+        # Agrupa segmentos nos maiores lotes que o backend aceita
+        batches, current, size = [], [], 0
+        for segment in segments:
+            extra = len(segment) + (1 if current else 0)
+            if current and size + extra > self.backend.max_chars:
+                batches.append(current)
+                current, size = [], 0
+                extra = len(segment)
+            current.append(segment)
+            size += extra
+        if current:
+            batches.append(current)
+        return batches
+
+    def _translate_batch(self, batch: List[str]) -> List[str]:
+        try:
+            with metrics.span("translate.batch", segments=len(batch)):
+                return self.backend.translate_batch(batch)
+        except Exception as e:
+            metrics.incr("translation_errors")
+            print(f"⚠️  Erro na tradução de um lote ({len(batch)} segmentos): {e}")
+            return None
+
+    def translate_many(self, texts: List[str]) -> List[str]:
+        """Traduz uma lista de textos, retornando o texto original quando a tradução falhar."""
+        return self.translate_many_checked(texts)[0]
+
+    def translate_many_checked(self, texts: List[str]) -> Tuple[List[str], List[bool]]:
+        """Como `translate_many`, com um indicador por texto: False quando algum segmento dele ficou sem
+        tradução (o texto volta no original ou misturado e não deve ser guardado como traduzido)."""
+        segmented = [self._segment(text) if text else [] for text in texts]
+        source, target = self.backend.source, self.backend.target
+        keys = {segment: self.memory.make_key(segment, source, target, self.backend.name) for segments in segmented for segment in segments}
+
+        known = self.memory.get_many(list(set(keys.values())))
+        translations = {segment: known[key] for segment, key in keys.items() if key in known}
+        missing = [segment for segment in keys if segment not in translations]
+        metrics.incr("cache_hits", len(keys) - len(missing), cache="translation")
+        metrics.incr("cache_misses", len(missing), cache="translation")
+
+        if missing:
+            batches = self._pack(missing)
+            print(f"🌐 Traduzindo {len(missing)} segmentos novos em {len(batches)} lote(s) ({len(translations)} da memória de tradução)")
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(batches)))) as executor:
+                results = list(executor.map(self._translate_batch, batches))
+            learned = {}
+            for batch, result in zip(batches, results):
+                if result is None:
+                    continue
+                for segment, translated in zip(batch, result):
+                    translations[segment] = translated
+                    learned[keys[segment]] = translated
+            if learned:
+                self.memory.put_many(learned)
+
+        output, complete = [], []
+        for text, segments in zip(texts, segmented):
+            if not segments:
+                output.append(text)
+            else:
+                output.append(" ".join(translations.get(segment, segment) for segment in segments))
+            complete.append(all(segment in translations for segment in segments))
+        return output, complete
+
+    def translate(self, text: str) -> str:
+        return self.translate_many([text])[0]